@@ -0,0 +1,118 @@
+# 신호 규칙 백테스트: 손절 / 익절(기준일 이후 고점 대비 하락) / 추매 규칙을 일별 종가 이력에 그대로 재생해 파라미터 조합별 성과 비교
+# - 종목마다 1단위 금액으로 진입, 손절/익절 신호에 전량 청산 후 다음 거래일 재진입, 추매 신호마다 1단위 추가 매수
+# - 청산 때마다 고점/평단이 초기화되는 경로 의존 규칙이라 날짜는 순서대로 진행하고, 종목 x 조합 전체를 한 배열로 묶어 날짜마다 한 번에 계산
+# - 조합들을 묶음으로 나눠 프로세스 풀에서 실행
+# 사용법: python backtest.py [티커 ...] [--since 2015-01-01] [--stop -5 -10 -15] [--take 5 10 15 20] [--add 30 50] [-o result.csv]
+#         티커를 생략하면 portfolio.db 보유 종목 사용
+import argparse
+import concurrent.futures as cf
+import itertools
+import os
+
+import numpy as np
+import pandas as pd
+
+from ohlcv_store import OhlcvStore
+from price_cache import SHARED as price_cache
+from quotes import kst_now, yf_symbol
+from valuation import signal_masks
+
+PARAM_COLS = ['손절(%)', '익절(%)', '추매(%)']
+RESULT_COLS = PARAM_COLS + ['수익률', 'MDD', '최대투입', '진입', '손절횟수', '익절횟수', '추매횟수']
+
+_PRICES = None  # 작업 프로세스별 종가 배열 (initializer 로 한 번만 전달)
+
+
+def param_grid(stops=(-10.0,), takes=(15.0,), adds=(50.0,)):
+    return np.array(list(itertools.product(stops, takes, adds)), dtype=float).reshape(-1, 3)
+
+
+def simulate(prices, grid):
+    # prices: 날짜 x 종목 종가(상장 전 NaN), grid: 조합 x (손절, 익절, 추매)
+    # 조합별 [수익률(%), MDD(%), 최대투입(단위), 진입, 손절, 익절, 추매] 반환
+    # 추매로 투입 금액이 계속 늘어나므로 수익률/MDD 는 최대 투입 금액 대비 누적 손익(고점 대비 하락)으로 계산
+    px = pd.DataFrame(prices).ffill().to_numpy(dtype=float)
+    T, N = px.shape
+    stop, take, add = (grid[:, i][None, :] for i in range(3))
+    qty, cost, high, realized = (np.zeros((N, len(grid))) for _ in range(4))
+    counts = np.zeros((4, len(grid)))
+    pnl, peak, mdd, max_cost = (np.zeros(len(grid)) for _ in range(4))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for t in range(T):
+            p = px[t][:, None]
+            held = qty > 0
+            avg = cost / qty
+            high = np.where(held, np.maximum(high, p), high)
+            sell, tk, ad = signal_masks((p - avg) / avg * 100, p, high, take, stop, add)
+            sell &= held; tk &= held; ad &= held
+            out = sell | tk
+            realized += np.where(out, qty * p - cost, 0.0)
+            qty = np.where(out, 0.0, qty + np.where(ad, 1.0 / p, 0.0))
+            cost = np.where(out, 0.0, cost + ad)
+            # 오늘 청산한 종목은 다음 거래일에 재진입
+            enter = ~held & ~np.isnan(p)
+            qty, cost, high = np.where(enter, 1.0 / p, qty), np.where(enter, 1.0, cost), np.where(enter, p, high)
+            counts += np.stack([enter.sum(0), sell.sum(0), tk.sum(0), ad.sum(0)])
+
+            pnl = realized.sum(0) + np.where(qty > 0, qty * p - cost, 0.0).sum(0)
+            max_cost = np.maximum(max_cost, cost.sum(0))
+            peak = np.maximum(peak, pnl)
+            mdd = np.minimum(mdd, np.where(max_cost > 0, (pnl - peak) / max_cost * 100, 0.0))
+        ret = np.where(max_cost > 0, pnl / max_cost * 100, 0.0)
+    return np.column_stack([ret, mdd, max_cost, counts.T])
+
+
+def _init_worker(prices):
+    global _PRICES
+    _PRICES = prices
+
+
+def _simulate_chunk(grid):
+    return simulate(_PRICES, grid)
+
+
+def run_backtest(closes, stops=(-10.0,), takes=(15.0,), adds=(50.0,), start=None, workers=None):
+    # closes: 날짜 x 티커 종가 패널. 조합별 결과 DataFrame (RESULT_COLS) 반환
+    if start is not None: closes = closes[closes.index >= pd.Timestamp(start, tz=closes.index.tz)]
+    prices, grid = closes.to_numpy(dtype=np.float64), param_grid(stops, takes, adds)
+    workers = min(workers or os.cpu_count() or 1, len(grid))
+    if workers <= 1:
+        res = simulate(prices, grid)
+    else:
+        # 묶음이 클수록 날짜당 배열 연산 효율이 좋으므로 작업자당 한 묶음
+        with cf.ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(prices,)) as pool:
+            res = np.vstack(list(pool.map(_simulate_chunk, np.array_split(grid, workers))))
+    out = pd.DataFrame(np.column_stack([grid, res]), columns=RESULT_COLS)
+    return out.astype({c: int for c in ['진입', '손절횟수', '익절횟수', '추매횟수']})
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="손절/익절/추매 규칙 백테스트 (파라미터 조합 비교)")
+    ap.add_argument("tickers", nargs="*", help="종목코드 또는 티커 (생략 시 portfolio.db 보유 종목)")
+    ap.add_argument("--since", default=(kst_now() - pd.DateOffset(years=10)).strftime('%Y-%m-%d'))
+    ap.add_argument("--stop", type=float, nargs="+", default=[-10.0])
+    ap.add_argument("--take", type=float, nargs="+", default=[5.0, 10.0, 15.0, 20.0, 30.0])
+    ap.add_argument("--add", type=float, nargs="+", default=[50.0])
+    ap.add_argument("--store", default=os.path.join("data", "ohlcv"), help="OHLCV 저장소 경로")
+    ap.add_argument("--no-refresh", action="store_true", help="시세를 새로 받지 않고 저장된 종가만 사용")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("-o", "--output", help="결과 출력 (.csv/.parquet/.json/.jsonl)")
+    args = ap.parse_args(argv)
+
+    if args.tickers: tickers = [yf_symbol(t) for t in args.tickers]
+    else:
+        from portfolio_store import PortfolioStore
+        tickers = list(dict.fromkeys(PortfolioStore().load()['종목코드'].map(yf_symbol)))
+    store = OhlcvStore(args.store)
+    if not args.no_refresh:
+        for sym, err in store.update_many(dict.fromkeys(tickers, args.since), cache=price_cache).items(): print(f"시세 조회 실패 {sym}: {err}")
+    result = run_backtest(store.close_panel(tickers), args.stop, args.take, args.add, start=args.since, workers=args.workers)
+    result = result.sort_values('수익률', ascending=False)
+    if args.output:
+        from batch import write_table
+        write_table(result, args.output)
+    print(result.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# 일괄 평가 CLI / 라이브러리: 여러 포트폴리오 CSV(종목명,종목코드,기준일,평균매수가,주식수,익절기준)를 한 번에 평가
+# - 모든 파일의 종목을 합쳐 티커당 한 번만 시세 갱신 (로컬 OHLCV 저장소 사용)
+# - 파일들을 묶음으로 나눠 프로세스 풀에서 읽기/평가, 묶음 단위로 한 번에 벡터 계산
+# 사용법: python batch.py portfolios/*.csv -o summary.csv [--details details.parquet] [--no-refresh] [--workers 8]
+import argparse
+import concurrent.futures as cf
+import csv
+import os
+import sys
+
+import pandas as pd
+
+from ohlcv_store import OhlcvStore
+from portfolio_store import PORTFOLIO_COLS, since_by_ticker
+from price_cache import SHARED as price_cache
+from quotes import yf_history
+from valuation import SIGNAL_STYLE, evaluate, summarize
+
+_CLOSES = None  # 작업 프로세스별 종가 패널 (initializer 로 한 번만 전달)
+
+
+NUM_COLS = ['평균매수가', '주식수', '익절기준']
+
+
+def read_many(paths):
+    # 파일마다 pandas 로 읽으면 호출 오버헤드가 커서 csv 모듈로 모은 뒤 DataFrame 을 한 번만 생성
+    # (보유 종목, {파일: 입력 오류}) 반환: 숫자/날짜가 잘못된 행은 빼고, 읽을 수 없는 파일은 건너뛰고 파일별로 보고 (일괄 처리는 계속)
+    rows, problems = [], {}
+    for path in paths:
+        try:
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                reader = csv.DictReader(f)
+                missing = [c for c in PORTFOLIO_COLS if c not in (reader.fieldnames or [])]
+                if missing: raise ValueError(f"컬럼 없음: {', '.join(missing)}")
+                rows.extend([*(r[c] for c in PORTFOLIO_COLS), path, reader.line_num] for r in reader)
+        except (OSError, UnicodeDecodeError, ValueError, csv.Error) as e:
+            problems[path] = f"{type(e).__name__}: {e}"
+    df = pd.DataFrame(rows, columns=PORTFOLIO_COLS + ['파일', '줄'])
+    for c in NUM_COLS: df[c] = pd.to_numeric(df[c], errors='coerce')
+    ref = pd.to_datetime(df['기준일'], format='mixed', errors='coerce')
+    bad = (df[NUM_COLS].isna().any(axis=1) | ref.isna()).to_numpy()
+    for path, lines in df.loc[bad].groupby('파일', sort=False)['줄']:
+        problems[path] = f"값 오류로 {len(lines)}행 제외 (줄 {', '.join(map(str, lines.tolist()[:10]))}{' …' if len(lines) > 10 else ''})"
+    df['기준일'] = ref.dt.strftime('%Y-%m-%d')
+    return df.loc[~bad].drop(columns='줄').reset_index(drop=True), problems
+
+
+def _init_worker(closes):
+    global _CLOSES
+    _CLOSES = closes
+
+
+def _value_chunk(args):
+    holdings, details, rules = args
+    valued = evaluate(holdings, _CLOSES, **rules)
+    return summarize(valued, '파일'), (valued if details else None)
+
+
+def _chunks(items, n):
+    size = max(1, -(-len(items) // n))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def value_portfolios(paths, store=None, refresh=True, source=yf_history, workers=None, details=False, **rules):
+    # (파일별 요약, 종목별 상세 또는 None, 종목별 조회 오류, 파일별 입력 오류) 반환. rules: evaluate 의 stop_pct/add_pct/take_pct
+    paths, store = list(paths), store or OhlcvStore()
+    workers = workers or os.cpu_count() or 1
+    with cf.ProcessPoolExecutor(workers) as pool:
+        parts, problems = [], {}
+        for df, bad in pool.map(read_many, _chunks(paths, workers * 4)):
+            parts.append(df); problems.update(bad)
+    since = since_by_ticker(pd.concat(parts, ignore_index=True)) if parts else {}
+    errors = store.update_many(since, source=source, cache=price_cache) if refresh and since else {}
+    closes = store.close_panel(list(since))
+    with cf.ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(closes,)) as pool:
+        results = list(pool.map(_value_chunk, [(p, details, rules) for p in parts]))
+
+    counts = pd.concat([p['파일'].value_counts(sort=False) for p in parts]) if parts else pd.Series(dtype=int)
+    summary = pd.concat([r for r, _ in results]) if results else pd.DataFrame(columns=['매수금액', '평가금액', '수익금', '수익률', *SIGNAL_STYLE])
+    summary = summary.reindex(paths)
+    summary.insert(0, '종목수', counts.reindex(paths).fillna(0).astype(int))
+    summary.insert(1, '시세없음', summary['종목수'] - summary[list(SIGNAL_STYLE)].sum(axis=1).fillna(0).astype(int))
+    summary = summary.fillna(0).rename_axis('파일').reset_index()
+    summary[list(SIGNAL_STYLE)] = summary[list(SIGNAL_STYLE)].astype(int)  # reindex 로 빈 파일이 NaN → float 이 된 신호 개수를 정수로
+    detail = pd.concat([d for _, d in results], ignore_index=True) if details and results else None
+    return summary, detail, errors, problems
+
+
+def write_table(df, path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".parquet": df.to_parquet(path, index=False)
+    elif ext in (".json", ".jsonl"): df.to_json(path, orient="records", force_ascii=False, lines=ext == ".jsonl")
+    else: df.to_csv(path, index=False, encoding="utf-8-sig")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="포트폴리오 CSV 일괄 평가")
+    ap.add_argument("paths", nargs="+", help="포트폴리오 CSV 파일들")
+    ap.add_argument("-o", "--output", default="summary.csv", help="요약 출력 (.csv/.parquet/.json/.jsonl)")
+    ap.add_argument("--details", help="종목별 상세 출력 경로 (.csv/.parquet/.json/.jsonl)")
+    ap.add_argument("--store", default=os.path.join("data", "ohlcv"), help="OHLCV 저장소 경로")
+    ap.add_argument("--no-refresh", action="store_true", help="시세를 새로 받지 않고 저장된 종가만 사용")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--stop-pct", type=float, default=-10.0)
+    ap.add_argument("--add-pct", type=float, default=50.0)
+    ap.add_argument("--take-pct", type=float, default=None, help="지정하지 않으면 파일의 익절기준 사용")
+    args = ap.parse_args(argv)
+
+    summary, detail, errors, problems = value_portfolios(args.paths, OhlcvStore(args.store), refresh=not args.no_refresh, workers=args.workers,
+                                               details=bool(args.details), stop_pct=args.stop_pct, add_pct=args.add_pct, take_pct=args.take_pct)
+    write_table(summary, args.output)
+    if detail is not None: write_table(detail, args.details)
+    for path, err in problems.items(): print(f"입력 오류 {path}: {err}", file=sys.stderr)
+    for sym, err in errors.items(): print(f"시세 조회 실패 {sym}: {err}", file=sys.stderr)
+    print(f"{len(summary)}개 포트폴리오 평가 완료 -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
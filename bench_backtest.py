@@ -0,0 +1,42 @@
+# 백테스트 벤치마크: 종목 x 기간 x 파라미터 조합 스윕 소요 시간 (합성 종가 사용)
+# 사용법: python bench_backtest.py [--tickers 500] [--years 10] [--workers 4]  (기본 조합: 손절 4 x 익절 5 x 추매 5 = 100)
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtest import run_backtest
+
+
+def make_closes(n_tickers, n_days, seed=0):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=n_days, tz='Asia/Seoul')
+    closes = 10000 * np.cumprod(1 + rng.normal(0.0003, 0.02, (n_days, n_tickers)), axis=0)
+    # 일부 종목은 기간 중간에 상장
+    listed = rng.integers(0, n_days // 2, n_tickers) * (rng.random(n_tickers) < 0.2)
+    closes[np.arange(n_days)[:, None] < listed[None, :]] = np.nan
+    return pd.DataFrame(closes.round(), index=idx, columns=[f"{i:06d}.KS" for i in range(n_tickers)])
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tickers", type=int, default=500)
+    ap.add_argument("--years", type=int, default=10)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--stop", type=float, nargs="+", default=[-5.0, -10.0, -15.0, -20.0])
+    ap.add_argument("--take", type=float, nargs="+", default=[5.0, 10.0, 15.0, 20.0, 30.0])
+    ap.add_argument("--add", type=float, nargs="+", default=[20.0, 30.0, 50.0, 75.0, 100.0])
+    args = ap.parse_args()
+
+    closes = make_closes(args.tickers, args.years * 252)
+    n = len(args.stop) * len(args.take) * len(args.add)
+    t0 = time.perf_counter()
+    result = run_backtest(closes, args.stop, args.take, args.add, workers=args.workers)
+    sec = time.perf_counter() - t0
+    print(f"{args.tickers}종목 x {len(closes)}거래일 x {n}조합: {sec:.2f}s ({args.tickers * len(closes) * n / sec / 1e6:,.1f}M 종목-일-조합/s)")
+    print(result.sort_values('수익률', ascending=False).head(10).to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# 거래 원장 벤치마크: 거래 N건을 추가하면서 건당 추가 시간, 보유 표 조회 시간, 체크포인트 유무별 재구성 시간을 측정
+# - 보유 표 조회(load)는 거래 이력 길이와 무관해야 하고, 체크포인트가 있으면 재구성은 마지막 체크포인트 이후 거래만 재생
+# 사용법: python bench_ledger.py [--trades 1000 10000 50000] [--positions 50] [--checkpoint-every 500]
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def ms(f, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter(); f(); best = min(best, time.perf_counter() - t)
+    return best * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--trades", type=int, nargs="+", default=[1000, 10000, 50000])
+    ap.add_argument("--positions", type=int, default=50)
+    ap.add_argument("--checkpoint-every", type=int, default=500)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    sys.path.insert(0, HERE)
+    from ledger import TradeLedger
+    from portfolio_store import PortfolioStore
+    work = tempfile.mkdtemp(prefix="bench_ledger_")
+    try:
+        store = PortfolioStore(os.path.join(work, "portfolio.db"), csv_path=None, cash_path=None)
+        ledger = TradeLedger(store, args.checkpoint_every)
+        rng = np.random.default_rng(args.seed)
+        pos = [ledger.buy({"종목명": f"종목{i:03d}", "종목코드": f"{i:06d}", "기준일": "2024-01-02", "평균매수가": 10000, "주식수": 1000, "익절기준": 15})
+               for i in range(args.positions)]
+        qty = dict.fromkeys(pos, 1000)
+        print(f"포지션 {args.positions}개 · 체크포인트 {args.checkpoint_every}건마다")
+        print(f"{'거래 수':>8} {'추가(ms/건)':>11} {'보유 표 조회(ms)':>16} {'재구성(ms)':>10} {'전체 재생(ms)':>13}")
+        n = args.positions
+        for target in sorted(args.trades):
+            t = time.perf_counter()
+            k = 0
+            while n < target:
+                p = pos[rng.integers(len(pos))]
+                if qty[p] > 1 and rng.random() < 0.4:
+                    q = int(rng.integers(1, qty[p])); ledger.sell(p, q, float(rng.integers(5000, 20000)), "2024-06-03"); qty[p] -= q
+                else:
+                    q = int(rng.integers(1, 100)); qty[p] += q
+                    ledger.buy({"종목명": "", "종목코드": "", "기준일": "2024-06-03", "평균매수가": float(rng.integers(5000, 20000)), "주식수": q, "익절기준": None}, position=p)
+                n += 1; k += 1
+            per = (time.perf_counter() - t) * 1000 / max(k, 1)
+            load = ms(store.load)
+            rebuild = ms(ledger.rebuild)
+            conn = store._connect()
+            saved = conn.execute("SELECT trade_id, state FROM checkpoints").fetchall()
+            conn.execute("DELETE FROM checkpoints")
+            full = ms(ledger.rebuild, repeat=1)
+            conn.executemany("INSERT INTO checkpoints (trade_id, state) VALUES (?, ?)", saved)
+            conn.close()
+            print(f"{n:>8,} {per:>11.2f} {load:>16.2f} {rebuild:>10.1f} {full:>13.1f}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
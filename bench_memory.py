@@ -0,0 +1,78 @@
+# 동시 세션 메모리 측정: test.py 를 Streamlit AppTest 세션 여러 개로 실행해 두고 프로세스 RSS 증가분을 세션 수로 나눔
+# - 임시 작업 폴더에 종목 목록 저장본/포트폴리오를 만들고 가짜 시세 피드(STOCK_QUOTE_SOURCE=fake)로 실행 (네트워크 없음)
+# - 세션당 값에는 AppTest 가 들고 있는 요소 트리(브라우저로 보낼 화면 내용)도 포함됨
+# 사용법: python bench_memory.py [--sessions 1 10 50] [--holdings 50] [--symbols 3000]
+import argparse
+import gc
+import os
+import shutil
+import sys
+import tempfile
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test.py")
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f: return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import psutil
+        return psutil.Process().memory_info().rss / 2**20
+
+
+def make_workdir(n_holdings, n_symbols, seed=0):
+    from symbols import META_FILE, SYMBOLS_FILE, save_index
+    rng = np.random.default_rng(seed)
+    work = tempfile.mkdtemp(prefix="bench_memory_")
+    os.chdir(work)
+    names = [f"종목{i:05d}" for i in range(n_symbols)]
+    symbols = pd.DataFrame({'Name': names, 'Symbol': [f"{i:06d}.KS" for i in range(n_symbols)]})
+    save_index(symbols, date.today(), SYMBOLS_FILE, META_FILE)
+    pick = rng.choice(n_symbols, n_holdings, replace=False)
+    pd.DataFrame({"종목명": [names[i] for i in pick], "종목코드": [f"{i:06d}" for i in pick],
+                  "기준일": (pd.Timestamp.today() - pd.to_timedelta(rng.integers(30, 300, n_holdings), unit='D')).strftime('%Y-%m-%d'),
+                  "평균매수가": rng.integers(5000, 90000, n_holdings), "주식수": rng.integers(1, 500, n_holdings), "익절기준": 15}
+                 ).to_csv("portfolio.csv", index=False)
+    return work
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 50])
+    ap.add_argument("--holdings", type=int, default=50)
+    ap.add_argument("--symbols", type=int, default=3000)
+    args = ap.parse_args()
+
+    sys.path.insert(0, os.path.dirname(APP))
+    os.environ["STOCK_QUOTE_SOURCE"] = "fake"
+    from streamlit.testing.v1 import AppTest
+    work = make_workdir(args.holdings, args.symbols)
+
+    def session():
+        at = AppTest.from_file(APP, default_timeout=120)
+        at.run()
+        assert not at.exception, at.exception
+        return at
+
+    # 첫 세션이 공유 자원(저장소, 갱신 작업자, 종목 인덱스, 평가 결과)을 만들기까지를 기준선으로 둠
+    warm = session(); warm.run()
+    gc.collect()
+    base = rss_mb()
+    print(f"작업 폴더 {work} · 보유 {args.holdings}종목 · 종목 목록 {args.symbols:,}개 · 공유 자원 포함 기준 RSS {base:,.1f} MB")
+    print(f"{'sessions':>8} {'RSS(MB)':>9} {'증가(MB)':>9} {'세션당(MB)':>10}")
+    sessions = []
+    for n in sorted(args.sessions):
+        while len(sessions) < n: sessions.append(session())
+        gc.collect()
+        rss = rss_mb()
+        print(f"{n:>8} {rss:>9,.1f} {rss - base:>9,.1f} {(rss - base) / n:>10,.2f}")
+    os.chdir(os.path.dirname(APP))
+    shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
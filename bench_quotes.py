@@ -0,0 +1,59 @@
+# 시세 조회 벤치마크: 기존 종목별 순차 호출 vs 병렬 일괄 조회 (로컬 가짜 시세 소스 사용)
+# 사용법: python bench_quotes.py [--latency 0.05] [--workers 8]
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from quotes import fetch_close_panel
+
+
+def make_fake_source(latency):
+    idx = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=22, tz='Asia/Seoul')
+
+    def source(symbol, period="1mo", interval="1d", start=None):
+        # 네트워크 왕복 지연을 흉내
+        time.sleep(latency)
+        rng = np.random.default_rng(abs(hash(symbol)) % (2 ** 32))
+        close = 10000 * np.cumprod(1 + rng.normal(0, 0.01, len(idx)))
+        return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': 0}, index=idx)
+    return source
+
+
+def old_path(symbols, source):
+    # test.py 의 기존 루프와 동일: 종목마다 blocking history 호출
+    closes = {}
+    for sym in symbols:
+        try:
+            df_h = source(sym, period="1mo")
+            if not df_h.empty: closes[sym] = df_h['Close'].iloc[-1]
+        except: continue
+    return closes
+
+
+def new_path(symbols, source, workers):
+    closes, _ = fetch_close_panel(symbols, period="1mo", source=source, max_workers=workers)
+    return closes.ffill().iloc[-1]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--latency", type=float, default=0.05)
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500])
+    args = ap.parse_args()
+
+    source = make_fake_source(args.latency)
+    print(f"latency={args.latency*1000:.0f}ms workers={args.workers}")
+    print(f"{'holdings':>8} {'old(s)':>9} {'new(s)':>9} {'speedup':>8}")
+    for n in args.sizes:
+        symbols = [f"{i:06d}.KS" for i in range(n)]
+        t0 = time.perf_counter(); old = old_path(symbols, source); t_old = time.perf_counter() - t0
+        t0 = time.perf_counter(); new = new_path(symbols, source, args.workers); t_new = time.perf_counter() - t0
+        assert np.allclose([old[s] for s in symbols], new[symbols].to_numpy())
+        print(f"{n:>8} {t_old:>9.2f} {t_new:>9.2f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# 모니터링 목록 렌더링 벤치마크: 종목별 위젯 행(render_rows) vs 표 하나(render_table)
+# Streamlit AppTest 로 스크립트 1회 실행(위젯 생성 + 직렬화) 시간과 생성된 요소 수를 측정 (브라우저 그리기 시간은 제외)
+# 사용법: python bench_render.py [--sizes 10 200 1000] [--repeat 3]
+import argparse
+import statistics
+import time
+
+from streamlit.testing.v1 import AppTest
+
+
+def app(mode, n):
+    import numpy as np
+    import pandas as pd
+
+    from monitor_table import render_rows, render_table
+    from valuation import evaluate
+
+    rng = np.random.default_rng(0)
+    idx = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=60, tz='Asia/Seoul')
+    tickers = [f"{i:06d}.KS" for i in range(n)]
+    closes = pd.DataFrame(10000 * np.cumprod(1 + rng.normal(0, 0.02, (60, n)), axis=0), index=idx, columns=tickers)
+    pf = pd.DataFrame({"종목명": [f"종목{i}" for i in range(n)], "종목코드": tickers, "기준일": idx[0].strftime('%Y-%m-%d'),
+                       "평균매수가": rng.integers(8000, 12000, n), "주식수": rng.integers(1, 100, n), "익절기준": 15})
+    valued = evaluate(pf, closes)
+    render_table(valued) if mode == "table" else render_rows(valued)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10, 200, 1000])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    print(f"{'holdings':>8} {'mode':>6} {'median(s)':>10} {'elements':>9}")
+    for n in args.sizes:
+        for mode in ("rows", "table"):
+            times = []
+            for _ in range(args.repeat):
+                at = AppTest.from_function(app, args=(mode, n), default_timeout=600)
+                t0 = time.perf_counter(); at.run(); times.append(time.perf_counter() - t0)
+                assert not at.exception, at.exception
+            elements = sum(1 for _ in at.main)
+            print(f"{n:>8} {mode:>6} {statistics.median(times):>10.3f} {elements:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# 종목 검색 마이크로 벤치마크: 전체 목록 선형 탐색 vs search.SymbolSearch 질의당 지연시간
+# 사용법: python bench_search.py [--size 4000]  (data/symbols.parquet 저장본이 있으면 실제 목록 사용)
+import argparse
+import random
+import statistics
+import time
+
+from search import SymbolSearch, chosung, normalize
+from symbols import load_index
+
+
+def synthetic_universe(n, seed=0):
+    rnd = random.Random(seed)
+    brands = ["KODEX", "TIGER", "ACE", "PLUS", "KBSTAR", "SOL", "HANARO", "RISE"]
+    names = set()
+    while len(names) < n:
+        word = "".join(chr(0xAC00 + rnd.randrange(11172)) for _ in range(rnd.randint(2, 6)))
+        names.add(f"{rnd.choice(brands)} {word}" if rnd.random() < 0.25 else word)
+    names = sorted(names)
+    return names, [f"{rnd.randrange(10 ** 6):06d}.KS" for _ in names]
+
+
+def linear(names, symbols, q, limit=20):
+    # 인덱스 없이 매 질의마다 전체 목록을 훑는 방식
+    q = normalize(q)
+    keys = [chosung(n) for n in names] if all("ㄱ" <= c <= "ㅎ" for c in q) else [normalize(n) for n in names]
+    if q[0].isdigit(): return [n for n, s in zip(names, symbols) if s.startswith(q)][:limit]
+    return [n for n, k in zip(names, keys) if q in k][:limit]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=4000)
+    ap.add_argument("--queries", type=int, default=2000)
+    args = ap.parse_args()
+
+    df, _ = load_index()
+    if df is not None and len(df) > 100: names, symbols = df['Name'].tolist(), df['Symbol'].tolist()
+    else: names, symbols = synthetic_universe(args.size)
+
+    t0 = time.perf_counter(); idx = SymbolSearch(names, symbols); t_build = time.perf_counter() - t0
+    rnd = random.Random(1)
+    queries = []
+    for _ in range(args.queries):
+        n, kind = rnd.choice(names), rnd.random()
+        k = normalize(n)
+        if kind < 0.4: queries.append(k[:rnd.randint(1, min(3, len(k)))])
+        elif kind < 0.7: queries.append(chosung(n)[:rnd.randint(2, 4)])
+        elif kind < 0.85: queries.append(k[len(k) // 2:len(k) // 2 + 2] or k)
+        else: queries.append(symbols[names.index(n)][:4])
+
+    print(f"universe={len(names)} build={t_build * 1000:.1f}ms queries={len(queries)}")
+    for label, fn in [("linear", lambda q: linear(names, symbols, q)), ("index", idx.query)]:
+        lat = []
+        for q in queries:
+            t0 = time.perf_counter(); fn(q); lat.append((time.perf_counter() - t0) * 1e6)
+        lat.sort()
+        print(f"{label:>7}: mean {statistics.fmean(lat):8.1f}us  p50 {lat[len(lat) // 2]:8.1f}us  p95 {lat[int(len(lat) * .95)]:8.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# 시작 시간 벤치마크: 새 프로세스에서 import 시간과 첫 실행의 화면별 도달 시간(ms)을 측정
+# - cold: 시세 저장소/스냅샷이 없는 작업 폴더 (종목 목록 저장본과 portfolio.csv 만 있음)
+# - warm: 같은 폴더에서 다시 시작 (지난 실행이 남긴 스냅샷/저장소 사용)
+# - 목록/요약까지 = 성능 계측(page) 단계 누적 시간. 그 뒤 단계(차트 등)는 화면 위쪽이 이미 전송된 뒤 실행됨
+# - 가짜 시세 피드(STOCK_QUOTE_SOURCE=fake) 사용, 네트워크 없음
+# 사용법: python bench_startup.py [--holdings 50] [--symbols 3000] [--repeat 3]
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+STAGES_TO_LIST = ['page_setup', 'symbol_list', 'refresher', 'portfolio_load', 'signals', 'render_header', 'render_list']
+STAGES_TO_SUMMARY = STAGES_TO_LIST + ['render_form', 'render_summary']
+
+
+def child(work, wait_snapshot=False):
+    # 새 프로세스 한 번: import 시간 + AppTest 로 test.py 1회 실행
+    # wait_snapshot: 백그라운드 첫 갱신이 스냅샷을 저장할 때까지 기다렸다 종료 (warm 준비용)
+    t0 = time.perf_counter()
+    import pandas  # noqa: F401
+    import streamlit  # noqa: F401
+    t_import = time.perf_counter() - t0
+    sys.path.insert(0, HERE)
+    os.chdir(work)
+    from streamlit.testing.v1 import AppTest
+
+    from timing import RUNS
+    at = AppTest.from_file(os.path.join(HERE, "test.py"), default_timeout=120)
+    t1 = time.perf_counter()
+    at.run()
+    t_run = time.perf_counter() - t1
+    assert not at.exception, at.exception
+    snap = os.path.join("data", "snapshot_fake.parquet")
+    for _ in range(600 if wait_snapshot else 0):
+        if os.path.exists(snap): break
+        time.sleep(0.1)
+    stages = next(r['stages'] for r in reversed(RUNS.runs) if r['kind'] == 'page')
+    print(json.dumps({'import': t_import, 'list': sum(stages.get(s, 0) for s in STAGES_TO_LIST),
+                      'summary': sum(stages.get(s, 0) for s in STAGES_TO_SUMMARY), 'run': t_run,
+                      'plotly_loaded': 'plotly.express' in sys.modules, 'status': at.caption[0].value if len(at.caption) else ""}), flush=True)
+    os._exit(0)  # 백그라운드 갱신 스레드 종료를 기다리지 않음
+
+
+def spawn(work, wait_snapshot=False):
+    env = dict(os.environ, STOCK_QUOTE_SOURCE="fake")
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", work] + (["--wait-snapshot"] if wait_snapshot else [])
+    out = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True, timeout=300)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def import_ms(module):
+    t = subprocess.run([sys.executable, "-c", f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"],
+                       capture_output=True, text=True, check=True)
+    return float(t.stdout) * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--holdings", type=int, default=50)
+    ap.add_argument("--symbols", type=int, default=3000)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--child")
+    ap.add_argument("--wait-snapshot", action="store_true")
+    args = ap.parse_args()
+    if args.child: return child(args.child, args.wait_snapshot)
+
+    sys.path.insert(0, HERE)
+    from bench_memory import make_workdir
+    base = os.getcwd()
+    print(f"import (새 프로세스): streamlit {import_ms('streamlit'):,.0f}ms · pandas {import_ms('pandas'):,.0f}ms · "
+          f"plotly.express {import_ms('plotly.express'):,.0f}ms (차트 구간에서만 로드)")
+    print(f"{'mode':>5} {'import(ms)':>10} {'목록까지(ms)':>12} {'요약까지(ms)':>12} {'전체 실행(ms)':>13}  상태")
+    for mode in ("cold", "warm"):
+        runs = []
+        for _ in range(args.repeat):
+            work = make_workdir(args.holdings, args.symbols)
+            os.chdir(base)
+            if mode == "warm": spawn(work, wait_snapshot=True)  # 이전 실행이 스냅샷/저장소를 남기도록 한 번 실행
+            runs.append(spawn(work))
+            shutil.rmtree(work, ignore_errors=True)
+        med = {k: statistics.median(r[k] for r in runs) * 1000 for k in ('import', 'list', 'summary', 'run')}
+        print(f"{mode:>5} {med['import']:>10,.0f} {med['list']:>12,.0f} {med['summary']:>12,.0f} {med['run']:>13,.0f}  {runs[-1]['status'][:40]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# 평가/신호 계산 벤치마크: 기존 행 단위 파이썬 루프 vs valuation.evaluate 벡터 연산
+# 사용법: python bench_valuation.py [--tickers 500] [--days 750]
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from valuation import evaluate
+
+
+def make_data(n_rows, n_tickers, n_days, seed=0):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=n_days, tz='Asia/Seoul')
+    tickers = [f"{i:06d}.KS" for i in range(n_tickers)]
+    closes = pd.DataFrame(10000 * np.cumprod(1 + rng.normal(0, 0.015, (n_days, n_tickers)), axis=0), index=idx, columns=tickers)
+    pick = rng.integers(0, n_tickers, n_rows)
+    ref = idx[rng.integers(0, n_days, n_rows)].tz_localize(None).strftime('%Y-%m-%d')
+    portfolio = pd.DataFrame({
+        "종목명": [f"종목{i}" for i in pick], "종목코드": [tickers[i] for i in pick], "기준일": ref,
+        "평균매수가": rng.integers(5000, 15000, n_rows), "주식수": rng.integers(1, 500, n_rows),
+        "익절기준": rng.choice([5, 10, 15, 20, 30], n_rows)})
+    return portfolio, closes
+
+
+def old_path(portfolio, closes):
+    # 기존 test.py 의 행 단위 계산 + 렌더링 루프의 신호 판정
+    out = []
+    for idx, row in portfolio.iterrows():
+        df_h = closes[row['종목코드']].dropna()
+        ref_dt = pd.to_datetime(row['기준일']).tz_localize('Asia/Seoul')
+        df_since = df_h[df_h.index >= ref_dt]
+        if df_since.empty: df_since = df_h
+        curr, mx = df_h.iloc[-1], df_since.max()
+        buy_amt, val_amt = row['평균매수가'] * row['주식수'], curr * row['주식수']
+        p_rate = ((curr - row['평균매수가']) / row['평균매수가'] * 100) if row['평균매수가'] > 0 else 0
+        sig = "HOLD"
+        if p_rate <= -10: sig = "SELL"
+        elif curr <= (mx * (1 - row['익절기준']/100)) and p_rate > 0: sig = "TAKE"
+        elif p_rate >= 50: sig = "ADD"
+        out.append((idx, val_amt, mx, sig))
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tickers", type=int, default=500)
+    ap.add_argument("--days", type=int, default=750)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    args = ap.parse_args()
+
+    print(f"tickers={args.tickers} days={args.days}")
+    print(f"{'rows':>7} {'old(s)':>9} {'new(s)':>9} {'speedup':>8}")
+    for n in args.sizes:
+        portfolio, closes = make_data(n, args.tickers, args.days)
+        t0 = time.perf_counter(); old = old_path(portfolio, closes); t_old = time.perf_counter() - t0
+        t0 = time.perf_counter(); new = evaluate(portfolio, closes); t_new = time.perf_counter() - t0
+        assert np.allclose([o[1] for o in old], new['평가금액']) and np.allclose([o[2] for o in old], new['고점'])
+        assert [o[3] for o in old] == list(new['신호'])
+        print(f"{n:>7} {t_old:>9.3f} {t_new:>9.3f} {t_old / t_new:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# 로컬 가짜 시세 피드: yf_history 와 같은 형태로 일봉 이력을 돌려주고, 마지막(당일) 봉 종가는 틱마다 조금씩 움직임
+# - 네트워크 없이 실시간 갱신 경로를 확인할 때 사용 (STOCK_QUOTE_SOURCE=fake streamlit run test.py)
+# - 틱마다 move_prob 확률로 일부 종목만 가격이 바뀌므로 "바뀐 종목만 갱신" 동작을 볼 수 있음
+# - 같은 seed 면 같은 시세 (종목별 난수 시드는 crc32(종목) 기반)
+import threading
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from quotes import KST, to_kst_dates
+
+PERIOD_BARS = {'1d': 1, '5d': 5, '1mo': 22, '3mo': 66, '6mo': 126, '1y': 250, '2y': 500, '5y': 1250}
+
+
+class FakeQuoteFeed:
+    def __init__(self, days=500, tick_sec=1.0, move_prob=0.3, daily_vol=0.015, tick_vol=0.002, seed=0, clock=time.time):
+        self.days, self.tick_sec, self.move_prob = days, tick_sec, move_prob
+        self.daily_vol, self.tick_vol, self.seed, self.clock = daily_vol, tick_vol, seed, clock
+        self._t0 = clock()
+        self._daily, self._live = {}, {}
+        self._lock = threading.Lock()
+
+    def _rng(self, symbol, salt=0):
+        return np.random.default_rng([self.seed, zlib.crc32(symbol.encode()), salt])
+
+    def _base(self, symbol):
+        if symbol not in self._daily:
+            idx = pd.bdate_range(end=pd.Timestamp.now(tz=KST).normalize(), periods=self.days)
+            start = 1000 + zlib.crc32(symbol.encode()) % 90000
+            close = start * np.cumprod(1 + self._rng(symbol).normal(0, self.daily_vol, len(idx)))
+            self._daily[symbol] = pd.Series(close.round(), index=to_kst_dates(idx))
+        return self._daily[symbol]
+
+    def price(self, symbol):
+        # 마지막 봉의 현재 종가: 지난 틱들을 순서대로 반영 (틱 번호가 같으면 같은 값)
+        with self._lock:
+            base = self._base(symbol)
+            tick = int((self.clock() - self._t0) / self.tick_sec)
+            done, px = self._live.get(symbol, (0, float(base.iloc[-1])))
+            for k in range(done + 1, tick + 1):
+                rng = self._rng(symbol, k)
+                if rng.random() < self.move_prob: px = max(1.0, float(round(px * (1 + rng.normal(0, self.tick_vol)))))
+            self._live[symbol] = (max(done, tick), px)
+            return px
+
+    def history(self, symbol, period="1mo", interval="1d", start=None):
+        close = self._base(symbol).copy()
+        close.iloc[-1] = self.price(symbol)
+        if start is not None: close = close[close.index >= pd.Timestamp(start, tz=KST)]
+        elif period in PERIOD_BARS: close = close.iloc[-PERIOD_BARS[period]:]
+        return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': 0.0})
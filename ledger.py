@@ -0,0 +1,166 @@
+# 거래 원장: 매수/매도 거래를 추가만 하는(append-only) trades 표에 기록하고, 포지션은 거래가 들어올 때마다 증분 갱신
+# - 포지션 = holdings 행 하나 (id 그대로). 대시보드는 지금처럼 holdings 만 읽으므로 거래 이력 길이와 무관
+# - 평균단가법: 매수 시 평단 재계산(수수료 포함), 매도 시 (매도가 - 평단) x 수량 - 수수료 를 실현손익에 누적
+# - 구분: BUY / SELL / SET(익절기준 변경) / VOID(잘못 입력한 포지션 정정 삭제, 손익 없이 수량 0)
+# - checkpoint_every 건마다 전체 포지션 상태(last_trade 포함)를 checkpoints 에 저장, rebuild() 는 마지막 체크포인트 이후 거래만 재생
+#   포지션은 거래가 있는 행만 → 체크포인트부터 재생하든 처음부터 재생하든 같은 holdings 가 나옴
+# - 원장 행 수정/삭제는 트리거로 막음 (정정은 VOID/SELL 등 새 거래로)
+import json
+
+import pandas as pd
+
+from portfolio_store import PORTFOLIO_COLS
+
+KINDS = ('BUY', 'SELL', 'SET', 'VOID')
+TRADE_COLS = ["구분", "거래일", "종목명", "종목코드", "수량", "가격", "수수료", "익절기준"]
+STATE_COLS = PORTFOLIO_COLS + ["실현손익"]
+SAVED_COLS = STATE_COLS + ["last_trade"]  # 체크포인트/재구성 시 holdings 에 쓰는 컬럼
+DEFAULT_TAKE = 15
+
+
+def _q(cols):
+    return ", ".join(f'"{c}"' for c in cols)
+
+
+def apply_trade(state, trade):
+    # 포지션 상태(dict 또는 None) + 거래(dict) -> 새 상태. 증분 갱신과 재생이 같은 규칙을 씀
+    s = dict(state) if state else {"종목명": trade["종목명"], "종목코드": trade["종목코드"], "기준일": trade["거래일"],
+                                   "평균매수가": 0.0, "주식수": 0, "익절기준": DEFAULT_TAKE, "실현손익": 0.0}
+    kind, qty, price, fee = trade["구분"], int(trade["수량"] or 0), float(trade["가격"] or 0), float(trade["수수료"] or 0)
+    if kind == 'BUY':
+        if qty <= 0: raise ValueError("매수 수량은 1 이상이어야 합니다")
+        if s["주식수"] == 0: s["기준일"] = trade["거래일"]
+        s["평균매수가"] = (s["평균매수가"] * s["주식수"] + price * qty + fee) / (s["주식수"] + qty)
+        s["주식수"] += qty
+    elif kind == 'SELL':
+        if not 0 < qty <= s["주식수"]: raise ValueError(f"매도 수량은 1 ~ 보유 수량({s['주식수']}) 이어야 합니다")
+        s["실현손익"] += (price - s["평균매수가"]) * qty - fee
+        s["주식수"] -= qty
+    elif kind == 'VOID':
+        s["주식수"] = 0
+    elif kind != 'SET':
+        raise ValueError(f"알 수 없는 거래 구분: {kind}")
+    if trade.get("익절기준") is not None: s["익절기준"] = trade["익절기준"]
+    return s
+
+
+class TradeLedger:
+    def __init__(self, store, checkpoint_every=500):
+        self.store, self.checkpoint_every = store, checkpoint_every
+        with store.transaction() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS trades (id INTEGER PRIMARY KEY AUTOINCREMENT, position INTEGER NOT NULL, '
+                         '"구분" TEXT NOT NULL, "거래일" TEXT NOT NULL, "종목명" TEXT NOT NULL, "종목코드" TEXT NOT NULL, '
+                         '"수량" INTEGER NOT NULL DEFAULT 0, "가격" REAL NOT NULL DEFAULT 0, "수수료" REAL NOT NULL DEFAULT 0, "익절기준" REAL, '
+                         "created TEXT NOT NULL DEFAULT (datetime('now')))")
+            conn.execute("CREATE INDEX IF NOT EXISTS trades_position ON trades (position, id)")
+            conn.execute("CREATE TRIGGER IF NOT EXISTS trades_no_update BEFORE UPDATE ON trades BEGIN SELECT RAISE(ABORT, 'trades is append-only'); END")
+            conn.execute("CREATE TRIGGER IF NOT EXISTS trades_no_delete BEFORE DELETE ON trades BEGIN SELECT RAISE(ABORT, 'trades is append-only'); END")
+            conn.execute("CREATE TABLE IF NOT EXISTS checkpoints (trade_id INTEGER PRIMARY KEY, state TEXT NOT NULL)")
+            cols = {r[1] for r in conn.execute("PRAGMA table_info(holdings)")}
+            if "실현손익" not in cols: conn.execute('ALTER TABLE holdings ADD COLUMN "실현손익" REAL NOT NULL DEFAULT 0')
+            if "last_trade" not in cols: conn.execute("ALTER TABLE holdings ADD COLUMN last_trade INTEGER NOT NULL DEFAULT 0")
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'ledger_migrated'").fetchone() is None:
+                self._migrate(conn)
+
+    def _migrate(self, conn):
+        # 기존 holdings 행마다 같은 id 포지션의 최초 매수 거래를 만들어 원장과 포지션을 맞춤
+        rows = conn.execute(f"SELECT id, {_q(PORTFOLIO_COLS)} FROM holdings ORDER BY id").fetchall()
+        for pid, name, code, ref, avg, qty, take in rows:
+            if qty > 0: self._append(conn, pid, {"구분": 'BUY', "거래일": ref, "종목명": name, "종목코드": code, "수량": qty,
+                                                 "가격": avg, "수수료": 0.0, "익절기준": take})
+        conn.execute("UPDATE holdings SET last_trade = (SELECT COALESCE(MAX(t.id), 0) FROM trades t WHERE t.position = holdings.id)")
+        conn.execute("DELETE FROM holdings WHERE last_trade = 0")  # 0주 행은 거래가 없어 원장으로 재현되지 않음 (화면에도 안 보이던 행)
+        conn.execute("INSERT INTO meta (key, value) VALUES ('ledger_migrated', datetime('now'))")
+
+    def _state(self, conn, position):
+        row = conn.execute(f"SELECT {_q(STATE_COLS)} FROM holdings WHERE id = ?", (int(position),)).fetchone()
+        return dict(zip(STATE_COLS, row)) if row else None
+
+    def _append(self, conn, position, trade):
+        cur = conn.execute(f"INSERT INTO trades (position, {_q(TRADE_COLS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                           [int(position)] + [trade.get(c) for c in TRADE_COLS])
+        return cur.lastrowid
+
+    def _write_state(self, conn, position, s, trade_id):
+        sets = ", ".join(f'"{c}" = ?' for c in STATE_COLS)
+        conn.execute(f"UPDATE holdings SET {sets}, last_trade = ? WHERE id = ?", [s[c] for c in STATE_COLS] + [trade_id, int(position)])
+
+    def record(self, position, trade, conn=None):
+        # 거래 1건 추가 + 해당 포지션만 갱신 (같은 트랜잭션). position=None 이면 새 포지션을 열고 id 반환
+        trade = {"수량": 0, "가격": 0.0, "수수료": 0.0, "익절기준": None, **trade}
+        if trade["구분"] not in KINDS: raise ValueError(f"알 수 없는 거래 구분: {trade['구분']}")
+        with self.store.transaction(conn) as c:
+            if position is None:
+                if trade["구분"] != 'BUY': raise ValueError("새 포지션은 매수로만 열 수 있습니다")
+                position = c.execute(f"INSERT INTO holdings ({_q(PORTFOLIO_COLS)}) VALUES (?, ?, ?, 0, 0, ?)",
+                                     (trade["종목명"], trade["종목코드"], trade["거래일"], trade["익절기준"] or DEFAULT_TAKE)).lastrowid
+            state = self._state(c, position)
+            if state is None: raise KeyError(f"포지션 {position} 없음")
+            trade = {**trade, "종목명": state["종목명"], "종목코드": state["종목코드"]}
+            new = apply_trade(state, trade)
+            trade_id = self._append(c, position, trade)
+            self._write_state(c, position, new, trade_id)
+            if trade_id % self.checkpoint_every == 0: self.checkpoint(c)
+        return position
+
+    def buy(self, row, position=None, fee=0.0, conn=None):
+        # row: PORTFOLIO_COLS 형식 (기준일 = 거래일, 평균매수가 = 매수가). 기존 포지션에 추가 매수하려면 position 지정
+        return self.record(position, {"구분": 'BUY', "거래일": row["기준일"], "종목명": row["종목명"], "종목코드": row["종목코드"],
+                                      "수량": int(row["주식수"]), "가격": float(row["평균매수가"]), "수수료": fee,
+                                      "익절기준": float(row["익절기준"]) if row.get("익절기준") is not None else None}, conn)
+
+    def sell(self, position, qty, price, day, fee=0.0, conn=None):
+        return self.record(position, {"구분": 'SELL', "거래일": day, "수량": int(qty), "가격": float(price), "수수료": fee}, conn)
+
+    def set_take(self, position, take_pct, day, conn=None):
+        return self.record(position, {"구분": 'SET', "거래일": day, "익절기준": float(take_pct)}, conn)
+
+    def void(self, position, day, conn=None):
+        return self.record(position, {"구분": 'VOID', "거래일": day}, conn)
+
+    def checkpoint(self, conn=None, keep=3):
+        # 현재 전체 포지션 상태를 마지막 거래 id 기준으로 저장 (최근 keep 개만 유지)
+        with self.store.transaction(conn) as c:
+            last = c.execute("SELECT COALESCE(MAX(id), 0) FROM trades").fetchone()[0]
+            rows = c.execute(f"SELECT id, {_q(SAVED_COLS)} FROM holdings WHERE last_trade > 0").fetchall()
+            state = {str(r[0]): dict(zip(SAVED_COLS, r[1:])) for r in rows}
+            c.execute("INSERT OR REPLACE INTO checkpoints (trade_id, state) VALUES (?, ?)", (last, json.dumps(state, ensure_ascii=False)))
+            c.execute("DELETE FROM checkpoints WHERE trade_id NOT IN (SELECT trade_id FROM checkpoints ORDER BY trade_id DESC LIMIT ?)", (keep,))
+        return last
+
+    def rebuild(self, conn=None):
+        # holdings 를 원장으로 다시 만듦: 마지막 체크포인트 상태 + 그 이후 거래만 재생. 재생한 거래 수 반환
+        with self.store.transaction(conn) as c:
+            cp = c.execute("SELECT trade_id, state FROM checkpoints ORDER BY trade_id DESC LIMIT 1").fetchone()
+            since, states = (cp[0], {int(k): v for k, v in json.loads(cp[1]).items()}) if cp else (0, {})
+            trades = c.execute(f"SELECT id, position, {_q(TRADE_COLS)} FROM trades WHERE id > ? ORDER BY id", (since,)).fetchall()
+            for tid, pos, *vals in trades:
+                states[pos] = {**apply_trade(states.get(pos), dict(zip(TRADE_COLS, vals))), "last_trade": tid}
+            c.execute("DELETE FROM holdings")
+            c.executemany(f"INSERT INTO holdings (id, {_q(SAVED_COLS)}) VALUES ({', '.join('?' * (len(SAVED_COLS) + 1))})",
+                          [[pos] + [s[k] for k in SAVED_COLS] for pos, s in sorted(states.items())])
+        return len(trades)
+
+    def changed_since(self, trade_id):
+        # (trade_id 이후 거래가 영향을 주는 가장 이른 거래일 또는 None, 마지막 거래 id) — NAV 이력 부분 재계산용
+        # VOID 는 잘못 입력한 포지션 정정이므로 그 포지션의 첫 거래일부터
+        conn = self.store._connect()
+        try:
+            return tuple(conn.execute(
+                'SELECT MIN(CASE WHEN "구분" = \'VOID\' THEN (SELECT MIN(t."거래일") FROM trades t WHERE t.position = trades.position) ELSE "거래일" END), '
+                'COALESCE(MAX(id), ?) FROM trades WHERE id > ?', (int(trade_id), int(trade_id))).fetchone())
+        finally: conn.close()
+
+    def trades(self, position=None, limit=None):
+        # 최근 거래부터 (position 지정 시 해당 포지션만)
+        where, params = ("WHERE position = ?", [int(position)]) if position is not None else ("", [])
+        sql = f"SELECT id, position, {_q(TRADE_COLS)}, created FROM trades {where} ORDER BY id DESC"
+        if limit: sql += f" LIMIT {int(limit)}"
+        conn = self.store._connect()
+        try: return pd.read_sql_query(sql, conn, params=params, index_col="id")
+        finally: conn.close()
+
+    def realized_total(self):
+        conn = self.store._connect()
+        try: return float(conn.execute('SELECT COALESCE(SUM("실현손익"), 0) FROM holdings').fetchone()[0])
+        finally: conn.close()
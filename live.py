@@ -0,0 +1,49 @@
+# 실시간 갱신용 평가 상태: 시세가 바뀐 종목만 다시 평가해 이전 결과에 덮어씀
+# - 종목별 지문 = (패널 구간, 마지막 유효 종가). 새 거래일이 붙거나 당일 종가가 바뀌면 변경으로 봄
+# - 보유 종목이 바뀌면(추가/수정/삭제) 전체 재평가
+# - 보유 종목/시세가 모든 세션에 같으므로 프로세스에 하나만 두고 공유 (잠금으로 갱신 직렬화, 결과는 읽기 전용)
+import threading
+
+import pandas as pd
+
+from quotes import yf_symbol
+from signal_engine import last_prices
+from valuation import SIGNAL_STYLE, evaluate
+
+SIGNAL_DTYPE = pd.CategoricalDtype(list(SIGNAL_STYLE))
+
+
+def fingerprints(closes):
+    # 패널 전체 ffill/notna 없이 마지막 행 위주로만 봄 (틱마다 이력 길이와 무관)
+    if closes.empty: return {}
+    span = (len(closes), closes.index[0], closes.index[-1])
+    return {col: (span, v) for col, v in last_prices(closes).items()}
+
+
+class LiveValuation:
+    def __init__(self, **rules):
+        self.rules = rules
+        self.valued, self.prints, self.holdings_key = None, {}, None
+        self._lock = threading.Lock()
+
+    def update(self, portfolio, closes):
+        # (평가금액 내림차순 valued, 이번에 다시 계산한 티커 집합) 반환
+        with self._lock: return self._update(portfolio, closes)
+
+    def _update(self, portfolio, closes):
+        key = int(pd.util.hash_pandas_object(portfolio, index=True).sum()) if len(portfolio) else 0
+        prints = fingerprints(closes)
+        tickers = portfolio['종목코드'].map(yf_symbol)
+        if self.valued is None or key != self.holdings_key:
+            changed = set(tickers)
+            valued = evaluate(portfolio, closes, **self.rules)
+        else:
+            changed = {t for t in set(tickers) if prints.get(t) != self.prints.get(t)}
+            if not changed: return self.valued, changed
+            rows = portfolio[tickers.isin(changed).to_numpy()]
+            part = evaluate(rows, closes, **self.rules)
+            valued = pd.concat([self.valued.drop(rows.index, errors='ignore'), part])
+        # 신호는 4가지 값뿐이라 범주형으로 보관
+        self.valued = valued.astype({'신호': SIGNAL_DTYPE}).sort_values('평가금액', ascending=False)
+        self.prints, self.holdings_key = prints, key
+        return self.valued, changed
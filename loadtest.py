@@ -0,0 +1,192 @@
+# 다중 세션 부하 테스트: 재생 데이터 제공자(replay.py)로 네트워크 없이 test.py 를 여러 AppTest 세션에서 실행
+# - 앱 프로세스 여러 개를 동시에 띄워 같은 DB/시세 저장소를 공유, 프로세스 안의 세션들은 번갈아 실행
+# - 세션마다 새로고침/신규 매수/추가 매수/정정 삭제 흐름을 무작위(seed 고정)로 반복하고, 흐름별 지연 p50/p95/p99 와 처리량을 보고
+# - fixture 폴더를 주지 않으면 가짜 시세로 종목 목록/일봉 fixture 를 만들어 사용 (녹화본은 STOCK_QUOTE_SOURCE=record 로 생성)
+# - 시세 조회 지연/실패율은 재생 제공자에 주입 (백그라운드 갱신 'refresh' 시간에 반영)
+# 사용법: python loadtest.py [--processes 2] [--sessions 5] [--iterations 10] [--holdings 15] [--latency 0.05] [--error-rate 0.02] [--fixtures DIR]
+import argparse
+import concurrent.futures as cf
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FLOWS = ['refresh', 'add', 'edit', 'delete']
+
+
+def make_fixtures(root, n_symbols=300, days=500, seed=0):
+    from fake_feed import FakeQuoteFeed
+    from replay import ReplayProvider
+    rp = ReplayProvider(root)
+    codes = [f"{100000 + i * 7:06d}" for i in range(n_symbols)]
+    names = [f"종목{i:04d}" for i in range(n_symbols)]
+    rp.save_listing('KRX', pd.DataFrame({'Code': codes, 'Name': names, 'Market': 'KOSPI'}))
+    rp.save_listing('ETF/KR', pd.DataFrame({'Symbol': ['292160'], 'Name': ['TIGER KRX300']}))
+    feed = FakeQuoteFeed(days=days, seed=seed)
+    for code in codes + ['292160']:
+        rp.save_history(f"{code}.KS", feed.history(f"{code}.KS", period=None))
+    return names, codes
+
+
+def make_workdir(fixtures, n_holdings, seed=0):
+    from replay import ReplayProvider
+    krx = ReplayProvider(fixtures).listing('KRX')
+    rng = np.random.default_rng(seed)
+    pick = rng.choice(len(krx), n_holdings, replace=False)
+    work = tempfile.mkdtemp(prefix="loadtest_")
+    pd.DataFrame({"종목명": krx['Name'].to_numpy()[pick], "종목코드": krx['Code'].to_numpy()[pick] + ".KS",
+                  "기준일": (pd.Timestamp.today() - pd.to_timedelta(rng.integers(30, 300, n_holdings), unit='D')).strftime('%Y-%m-%d'),
+                  "평균매수가": rng.integers(5000, 90000, n_holdings), "주식수": rng.integers(1, 500, n_holdings), "익절기준": 15}
+                 ).to_csv(os.path.join(work, "portfolio.csv"), index=False)
+    return work, krx['Name'].tolist()
+
+
+def _widget(elements, label):
+    return next(w for w in elements if w.label == label)
+
+
+class Session:
+    # AppTest 세션 하나: 흐름을 실행하고 흐름별 소요 시간(초)과 실패 횟수를 기록
+    def __init__(self, names, rng, min_holdings=5, max_holdings=25):
+        from streamlit.testing.v1 import AppTest
+        self.at = AppTest.from_file(os.path.join(HERE, "test.py"), default_timeout=120)
+        self.names, self.rng = names, rng
+        self.min_holdings, self.max_holdings = min_holdings, max_holdings
+        self.samples, self.errors = defaultdict(list), defaultdict(int)
+
+    def run(self):
+        self.at.run()
+        if self.at.exception: raise RuntimeError(self.at.exception[0].message)
+
+    def holding_ids(self):
+        return [b.key[2:] for b in self.at.button if b.key and b.key.startswith("e_")]
+
+    def step(self):
+        ids = self.holding_ids()
+        flow = FLOWS[self.rng.integers(len(FLOWS))]
+        if flow == 'delete' and len(ids) <= self.min_holdings: flow = 'add'
+        if flow == 'add' and len(ids) >= self.max_holdings: flow = 'edit'
+        if flow in ('edit', 'delete') and not ids: flow = 'refresh'
+        t0 = time.perf_counter()
+        try:
+            getattr(self, flow)(ids)
+            self.samples[flow].append(time.perf_counter() - t0)
+        except Exception:
+            self.errors[flow] += 1
+            self.run()
+
+    def refresh(self, ids):
+        self.run()
+
+    def _save_form(self, qty):
+        # 신규는 '평균매수가', 기존 포지션은 기본 거래(추가 매수)의 '매수가'
+        next(w for w in self.at.number_input if w.label in ("평균매수가", "매수가")).set_value(int(self.rng.integers(5000, 90000)))
+        _widget(self.at.number_input, "수량").set_value(qty)
+        _widget(self.at.button, "저장").click()
+        self.run()
+
+    def add(self, ids):
+        name = self.names[self.rng.integers(len(self.names))]
+        _widget(self.at.text_input, "종목 검색").input(name)
+        self.run()
+        box = _widget(self.at.selectbox, "종목명")
+        box.select(name if name in box.options else box.options[-1])
+        self._save_form(int(self.rng.integers(1, 500)))
+
+    def edit(self, ids):
+        self.at.button(key=f"e_{ids[self.rng.integers(len(ids))]}").click()
+        self.run()
+        self._save_form(int(self.rng.integers(1, 500)))
+
+    def delete(self, ids):
+        self.at.button(key=f"d_{ids[self.rng.integers(len(ids))]}").click()
+        self.run()
+
+
+def percentiles(values):
+    v = np.asarray(values) * 1000
+    return {'횟수': len(v), 'p50(ms)': np.percentile(v, 50), 'p95(ms)': np.percentile(v, 95), 'p99(ms)': np.percentile(v, 99), 'max(ms)': v.max()}
+
+
+def drive(work, env, n_sessions, iterations, seed, worker):
+    # 작업 프로세스 하나 = 앱 서버 하나: 세션들이 공유 자원(갱신 작업자, 평가 결과 등)을 함께 쓰며 번갈아 흐름 실행
+    # (AppTest 는 실행마다 프로세스 전역 런타임을 만들고 지우므로 한 프로세스 안에서는 동시에 돌릴 수 없음)
+    sys.path.insert(0, HERE)
+    os.environ.update(env)
+    os.chdir(work)
+    from timing import RUNS
+    sessions = [Session(NAMES, np.random.default_rng([seed, worker, i])) for i in range(n_sessions)]
+    for s in sessions: s.run()  # 첫 실행(공유 자원 생성 포함)은 측정에서 제외
+    for _ in range(iterations):
+        for s in sessions: s.step()
+    logging.disable(logging.CRITICAL)  # 작업 폴더 정리 후에도 도는 백그라운드 갱신의 오류 로그 숨김
+    return ([dict(s.samples) for s in sessions], [dict(s.errors) for s in sessions],
+            [r['total'] for r in RUNS.runs if r['kind'] == 'refresh'])
+
+
+NAMES = []
+
+
+def _init_worker(names):
+    NAMES[:] = names
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--processes", type=int, default=2, help="동시에 띄울 앱 프로세스 수 (같은 DB/저장소 공유)")
+    ap.add_argument("--sessions", type=int, default=5, help="프로세스당 세션 수")
+    ap.add_argument("--iterations", type=int, default=10, help="세션당 흐름 실행 횟수")
+    ap.add_argument("--holdings", type=int, default=15)
+    ap.add_argument("--symbols", type=int, default=300, help="fixture 를 만들 때 종목 수")
+    ap.add_argument("--fixtures", help="녹화된 fixture 폴더 (없으면 가짜 시세로 생성)")
+    ap.add_argument("--latency", type=float, default=0.05, help="시세/목록 조회당 지연(초)")
+    ap.add_argument("--jitter", type=float, default=0.05)
+    ap.add_argument("--error-rate", type=float, default=0.02)
+    ap.add_argument("--refresh-sec", type=int, default=5, help="백그라운드 시세 갱신 주기(초)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--keep", action="store_true", help="작업 폴더를 지우지 않음")
+    args = ap.parse_args()
+
+    sys.path.insert(0, HERE)
+    fixtures = os.path.abspath(args.fixtures) if args.fixtures else tempfile.mkdtemp(prefix="fixtures_")
+    if not args.fixtures: make_fixtures(fixtures, args.symbols, seed=args.seed)
+    work, names = make_workdir(fixtures, args.holdings, args.seed)
+    env = dict(STOCK_QUOTE_SOURCE="replay", REPLAY_FIXTURES=fixtures, REPLAY_LATENCY=str(args.latency), REPLAY_JITTER=str(args.jitter),
+               REPLAY_ERROR_RATE=str(args.error_rate), REPLAY_SEED=str(args.seed), LIVE_REFRESH_SEC=str(args.refresh_sec))
+
+    t0 = time.perf_counter()
+    try:
+        with cf.ProcessPoolExecutor(args.processes, initializer=_init_worker, initargs=(names,)) as pool:
+            results = list(pool.map(drive, *zip(*[(work, env, args.sessions, args.iterations, args.seed, w) for w in range(args.processes)])))
+    finally:
+        if not args.keep:
+            shutil.rmtree(work, ignore_errors=True)
+            if not args.fixtures: shutil.rmtree(fixtures, ignore_errors=True)
+    wall = time.perf_counter() - t0
+
+    merged, errors, refresh = defaultdict(list), defaultdict(int), []
+    for samples, errs, ref in results:
+        for d in samples:
+            for flow, v in d.items(): merged[flow].extend(v)
+        for d in errs:
+            for flow, n in d.items(): errors[flow] += n
+        refresh.extend(ref)
+    rows = {flow: {**(percentiles(merged[flow]) if merged[flow] else {'횟수': 0}), '오류': errors[flow]}
+            for flow in FLOWS if merged[flow] or errors[flow]}
+    if refresh: rows['(백그라운드 갱신)'] = {**percentiles(refresh), '오류': 0}
+    total = sum(len(v) for v in merged.values())
+    print(f"프로세스 {args.processes} x 세션 {args.sessions} x 흐름 {args.iterations}회 · 보유 {args.holdings}종목 · "
+          f"조회 지연 {args.latency}+U(0,{args.jitter})s · 실패율 {args.error_rate:.0%}")
+    print(pd.DataFrame.from_dict(rows, orient='index').to_string(float_format=lambda v: f"{v:,.1f}"))
+    print(f"처리량: {total / wall:,.2f} 흐름/s ({total}회 / {wall:,.1f}s, 준비 실행 포함)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# 실시간 모니터링 목록 렌더링
+# - render_rows: 종목마다 st.columns 행 + 버튼 (기존 방식, 종목 수에 비례해 위젯이 늘어남)
+# - render_table: 전체 목록을 데이터 그리드 하나로 표시 (가상 스크롤/열 정렬은 그리드가 처리, 수정/삭제는 행 선택)
+# 두 함수 모두 사용자가 누른 동작을 ('edit' | 'delete', 행 id) 로 돌려주고, 없으면 None
+import pandas as pd
+import streamlit as st
+
+from valuation import SIGNAL_STYLE
+
+ROW_WIDTHS = [1.5, 1.2, 0.8, 0.5, 1.2, 1.2, 1.2, 1.0, 0.5, 0.5]
+UP, DOWN = "#28a745", "#dc3545"
+
+
+def render_rows(valued):
+    action = None
+    # [개선 반영] vertical_alignment="center"를 사용하여 CSS 의존도 낮춤
+    h = st.columns(ROW_WIDTHS, vertical_alignment="center")
+    titles = ["종목명", "기준일(고점)", "평단가", "수량", "평가금액", "현재가(대비)", "수익(률)", "신호", "", ""]
+    for i, t in enumerate(titles): h[i].markdown(f"<p style='color:gray; font-size:0.9em; margin-bottom:0;'><b>{t}</b></p>", unsafe_allow_html=True)
+
+    for idx, r in valued.iterrows():
+        st.markdown("<div class='stock-divider'></div>", unsafe_allow_html=True)
+        curr, mx, p_rate, drop_val = r['현재가'], r['고점'], r['수익률'], r['고점대비']
+        sig, clr, bg = SIGNAL_STYLE[r['신호']]
+
+        d = st.columns(ROW_WIDTHS, vertical_alignment="center")
+
+        d[0].markdown(f"**{r['종목명']}**")
+        d[1].markdown(f"<span style='font-size:0.85em;'>{r['기준일']}<br>(高:{mx:,.0f})</span>", unsafe_allow_html=True)
+        d[2].markdown(f"{r['평균매수가']:,.0f}")
+        d[3].markdown(f"{r['주식수']}")
+        d[4].markdown(f"{r['평가금액']:,.0f}원")
+
+        d[5].markdown(f"{curr:,.0f}원<br><span style='font-size:0.8em; color:{DOWN if drop_val < 0 else UP};'>{drop_val:+.1f}%</span>", unsafe_allow_html=True)
+
+        d[6].markdown(f"<span style='color:{DOWN if p_rate < 0 else UP}; font-weight:bold;'>{r['수익금']:,.0f}원<br>({p_rate:.1f}%)</span>", unsafe_allow_html=True)
+
+        d[7].markdown(f"<div style='background-color:{bg}; color:{clr}; padding:4px 8px; border-radius:15px; text-align:center; font-weight:bold; font-size:0.7em;'>{sig}</div>", unsafe_allow_html=True)
+
+        with d[8]:
+            if st.button("수정", key=f"e_{idx}"): action = ('edit', idx)
+        with d[9]:
+            if st.button("삭제", key=f"d_{idx}"): action = ('delete', idx)
+    return action
+
+
+def table_frame(valued):
+    return pd.DataFrame({
+        '종목명': valued['종목명'], '신호': valued['신호'].map(lambda s: SIGNAL_STYLE[s][0]), '기준일': valued['기준일'],
+        '고점': valued['고점'], '평단가': valued['평균매수가'], '수량': valued['주식수'], '평가금액': valued['평가금액'],
+        '현재가': valued['현재가'], '고점대비(%)': valued['고점대비'], '수익금': valued['수익금'], '수익률(%)': valued['수익률'],
+    }, index=valued.index)
+
+
+_SIGNAL_CSS = {label: f"background-color: {bg}; color: {clr}; font-weight: bold" for label, clr, bg in SIGNAL_STYLE.values()}
+
+
+def _sign_css(v):
+    return f"color: {DOWN if v < 0 else UP}"
+
+
+def render_table(valued, key="monitor_grid"):
+    df = table_frame(valued)
+    # 색상은 신호/수익 컬럼에만 적용 (스타일 계산 비용을 행 수 x 3 셀로 제한)
+    styler = df.style.map(_SIGNAL_CSS.get, subset=['신호']).map(_sign_css, subset=['고점대비(%)', '수익금', '수익률(%)'])
+    money = st.column_config.NumberColumn(format="localized")
+    event = st.dataframe(
+        styler, key=key, on_select="rerun", selection_mode="single-row", hide_index=True, use_container_width=True,
+        height=min(38 + 35 * len(df), 600),
+        column_config={'고점': money, '평단가': money, '평가금액': money, '현재가': money, '수익금': money,
+                       '고점대비(%)': st.column_config.NumberColumn(format="%+.1f"), '수익률(%)': st.column_config.NumberColumn(format="%.1f")})
+    rows = event.selection.rows
+    if not rows: return None
+    idx = df.index[rows[0]]
+    st.caption(f"선택: **{df.at[idx, '종목명']}**")
+    b1, b2, _ = st.columns([1, 1, 8])
+    if b1.button("수정", key=f"{key}_edit"): return ('edit', idx)
+    if b2.button("삭제", key=f"{key}_delete"): return ('delete', idx)
+    return None
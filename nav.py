@@ -0,0 +1,99 @@
+# 일별 포트폴리오 NAV 이력: 저장된 종가 x 보유 종목(기준일 이후 보유로 간주) + 예수금
+# - 처음 한 번 전체 계산, 이후에는 마지막 저장일부터 새 거래일만 덧붙임
+# - 보유 종목/예수금이 바뀌면 변경일 이전 행은 그대로 두고 변경일부터만 현재 보유로 다시 계산 (매도한 종목의 과거 낙폭이 지워지지 않음)
+#   변경일: 거래 원장(ledger)의 새 거래 거래일 중 가장 이른 날, 예수금 변경은 마지막 저장일(오늘)
+# - 고점 NAV/낙폭도 함께 저장해 차트는 계산 없이 테이블만 읽음
+# - 테이블은 공유 NavHistory 가 메모리에 들고 있어 재실행마다 파일을 읽지 않고, 종가는 마지막 저장일 이후 구간만 채움(ffill)
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from quotes import KST, yf_symbol
+from signal_engine import last_prices
+from symbols import atomic_replace, write_json
+
+NAV_COLS = ['평가금액', '매수금액', '예수금', 'NAV', '고점NAV', '낙폭']
+
+
+def holdings_key(portfolio, cash):
+    cols = ['종목코드', '기준일', '평균매수가', '주식수']
+    h = int(pd.util.hash_pandas_object(portfolio[cols].astype(str), index=False).sum()) if len(portfolio) else 0
+    return f"{h}:{float(cash)}"
+
+
+def build_nav(portfolio, closes, cash, start=None, end=None):
+    # [start, end) 거래일의 NAV 행 (고점/낙폭 제외)
+    lo = 0 if start is None else closes.index.searchsorted(start)
+    hi = len(closes) if end is None else closes.index.searchsorted(end)
+    window = closes.iloc[lo:hi]
+    dates = window.index
+    if len(dates) == 0 or portfolio.empty: return pd.DataFrame(columns=NAV_COLS[:4], index=pd.DatetimeIndex([], tz=KST))
+    col = pd.Index(closes.columns).get_indexer(portfolio['종목코드'].map(yf_symbol))
+    # 휴장일이 다른 종목은 직전 종가로 채움 (구간 앞의 마지막 유효 종가에서 이어서), 시세가 없는 종목은 0
+    if lo > 0: window = pd.concat([last_prices(closes.iloc[:lo]).to_frame().T, window])
+    px = np.nan_to_num(window.ffill().to_numpy(dtype=float)[:, col] * (col >= 0), nan=0.0)[-len(dates):]
+    ref = pd.DatetimeIndex(pd.to_datetime(portfolio['기준일'])).tz_localize(KST).as_unit('ns').asi8
+    held = pd.DatetimeIndex(dates).as_unit('ns').asi8[:, None] >= ref[None, :]
+    qty, avg = portfolio['주식수'].to_numpy(dtype=float), portfolio['평균매수가'].to_numpy(dtype=float)
+    val = (px * qty * held).sum(axis=1)
+    buy = (held * (qty * avg)).sum(axis=1)
+    return pd.DataFrame({'평가금액': val, '매수금액': buy, '예수금': float(cash), 'NAV': val + float(cash)}, index=dates)
+
+
+def with_drawdown(nav, prev_peak=-np.inf):
+    peak = np.maximum.accumulate(np.maximum(nav['NAV'].to_numpy(dtype=float), prev_peak)) if len(nav) else np.array([])
+    return nav.assign(고점NAV=peak, 낙폭=np.where(peak > 0, nav['NAV'] / np.where(peak > 0, peak, 1) * 100 - 100, 0.0))
+
+
+class NavHistory:
+    def __init__(self, path=os.path.join("data", "nav.parquet")):
+        self.path, self.meta_path = path, os.path.splitext(path)[0] + ".json"
+        self.nav, self.meta = None, {}  # 메모리 사본 (처음 update 때 파일에서 한 번 읽음)
+        self._lock = threading.Lock()
+
+    def read(self):
+        try:
+            with open(self.meta_path) as f: meta = json.load(f)
+            return pd.read_parquet(self.path), meta
+        except (FileNotFoundError, ValueError, OSError):
+            return None, {}
+
+    def _write(self, nav, meta):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        atomic_replace(self.path, nav.to_parquet)
+        atomic_replace(self.meta_path, write_json(meta))
+        self.nav, self.meta = nav, meta
+
+    def update(self, portfolio, closes, cash, ledger=None):
+        # 저장된 NAV 를 최신 종가까지 연장해 반환. 마지막 저장일(장중 값일 수 있음)은 다시 계산해 교체
+        # ledger(TradeLedger): 지난 갱신 이후 거래의 거래일부터 다시 계산 (없으면 보유 변경도 마지막 저장일부터)
+        key = holdings_key(portfolio, cash)
+        with self._lock:
+            if self.nav is None: self.nav, self.meta = self.read()
+            return self._update(portfolio, closes, float(cash), key, ledger)
+
+    def _update(self, portfolio, closes, cash, key, ledger):
+        nav, meta = self.nav, self.meta
+        changed_from, trade_id = ledger.changed_since(meta.get('trade_id', 0)) if ledger is not None else (None, 0)
+        new_meta = {'key': key, 'cash': cash, 'trade_id': trade_id}
+        if nav is None or nav.empty or 'cash' not in meta:
+            # 처음 (또는 변경일 정보가 없던 이전 형식 파일): 전체 계산
+            nav = with_drawdown(build_nav(portfolio, closes, cash))
+        else:
+            last = nav.index[-1]
+            if len(closes.index) and closes.index[-1] < last and meta == new_meta: return nav
+            start = last
+            if changed_from is not None: start = min(start, pd.Timestamp(changed_from, tz=KST))
+            if len(closes.index) and closes.index[0] < nav.index[0]:
+                # 더 이른 기준일 종목이 추가돼 종가가 앞으로 늘어난 경우: 없던 앞 구간만 현재 보유로 채움
+                nav = pd.concat([build_nav(portfolio, closes, cash, end=nav.index[0]), nav[NAV_COLS[:4]]])
+                nav = with_drawdown(nav)
+            head = nav[nav.index < start]
+            tail = with_drawdown(build_nav(portfolio, closes, cash, start=start), head['고점NAV'].iloc[-1] if len(head) else -np.inf)
+            if meta == new_meta and tail.equals(nav[nav.index >= start]): return nav
+            nav = pd.concat([head, tail])
+        self._write(nav, new_meta)
+        return nav
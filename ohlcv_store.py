@@ -0,0 +1,97 @@
+# 로컬 OHLCV 저장소: 종목별 Parquet 파일 하나에 일봉 이력을 보관하고, 새로고침 시 빠진 꼬리만 받아 덧붙임
+# - 파일은 임시 파일에 쓴 뒤 os.replace 로 교체하므로 읽는 쪽은 항상 완전한 이전/이후 파일 중 하나를 봄
+# - 같은 종목을 동시에 갱신하지 않도록 종목별 잠금 사용
+# - 처음 받을 때는 기준일보다 FETCH_BUFFER_DAYS 앞당겨 조회하고, 요청한 시작일을 파일 메타데이터(covered_from)로 남김
+#   → 기준일이 주말/휴장일/상장 전이어서 그날 봉이 없어도 '이미 받은 구간'으로 판단해 다음부터는 꼬리만 조회
+# - 가격은 수정주가가 아닌 실제 종가(basis='raw'). 이전 수정주가로 받은 파일(표시 없음)은 저장 구간 전체를 한 번 다시 받아 교체
+import os
+import tempfile
+import threading
+from collections import defaultdict
+
+import pandas as pd
+
+from quotes import close_panel, fetch_histories, to_kst_dates, yf_history
+
+OHLCV_COLS = ['Open', 'High', 'Low', 'Close', 'Volume']
+FETCH_BUFFER_DAYS = 14  # 달력 기준 (긴 연휴에도 직전 거래일 봉이 포함되도록)
+
+
+class OhlcvStore:
+    def __init__(self, root=os.path.join("data", "ohlcv")):
+        self.root = root
+        self._locks = defaultdict(threading.Lock)
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, symbol):
+        return os.path.join(self.root, f"{symbol.replace('/', '_')}.parquet")
+
+    def read(self, symbol):
+        try: return pd.read_parquet(self.path(symbol))
+        except FileNotFoundError: return pd.DataFrame(columns=OHLCV_COLS, index=pd.DatetimeIndex([], tz='Asia/Seoul'))
+
+    def _write(self, symbol, df):
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        os.close(fd)
+        try:
+            df.to_parquet(tmp)
+            os.replace(tmp, self.path(symbol))
+        except BaseException:
+            if os.path.exists(tmp): os.remove(tmp)
+            raise
+
+    @staticmethod
+    def covered_from(df):
+        # 지금까지 요청해 받은 가장 이른 시작일 (메타데이터가 없는 이전 파일은 첫 봉 날짜)
+        if df.empty: return None
+        c = df.attrs.get('covered_from')
+        return pd.Timestamp(c, tz='Asia/Seoul') if c else df.index[0]
+
+    def _plan(self, symbol, since):
+        # (받아야 할 시작일, 꼬리 조회 여부): 저장분이 since 를 덮으면 마지막 저장일(당일 봉 갱신용)부터, 아니면 since - 여유일부터
+        df = self.read(symbol)
+        since = pd.Timestamp(since).tz_localize('Asia/Seoul') if pd.Timestamp(since).tz is None else pd.Timestamp(since)
+        if df.empty or self.covered_from(df) > since: return since - pd.Timedelta(days=FETCH_BUFFER_DAYS), False
+        if df.attrs.get('basis') != 'raw': return min(self.covered_from(df), since) - pd.Timedelta(days=FETCH_BUFFER_DAYS), False
+        return df.index[-1], True
+
+    def merge(self, symbol, fetched, start=None):
+        # 받아온 구간을 저장분에 합치고(겹치는 날은 새 값 우선) 바뀐 경우에만 파일 교체
+        # start: 이번 조회의 요청 시작일 (covered_from 갱신용)
+        fetched = fetched[[c for c in OHLCV_COLS if c in fetched.columns]].copy()
+        fetched.index = to_kst_dates(fetched.index)
+        with self._locks[symbol]:
+            old = self.read(symbol)
+            merged = pd.concat([old, fetched]) if not old.empty else fetched
+            merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+            starts = [t for t in (self.covered_from(old), merged.index[0] if not merged.empty else None,
+                                  pd.Timestamp(start, tz='Asia/Seoul') if start is not None else None) if t is not None]
+            # 수정주가 시절 파일은 저장 구간 전체를 다시 받아 덮었을 때만 raw 로 표시
+            raw = old.empty or old.attrs.get('basis') == 'raw' or (bool(starts) and start is not None and pd.Timestamp(start, tz='Asia/Seoul') <= self.covered_from(old))
+            if starts: merged.attrs = {'covered_from': min(starts).strftime('%Y-%m-%d'), **({'basis': 'raw'} if raw else {})}
+            if not merged.equals(old) or merged.attrs != old.attrs: self._write(symbol, merged)
+        return len(fetched)
+
+    def update_many(self, since_by_symbol, source=yf_history, max_workers=8, timeout=10.0, cache=None, timings=None):
+        # 시작일이 같은 종목끼리 묶어 병렬 조회 (평소엔 모두 마지막 저장일이라 한 묶음)
+        groups, tails = defaultdict(list), set()
+        for sym, since in since_by_symbol.items():
+            start, tail = self._plan(sym, since)
+            groups[start.strftime('%Y-%m-%d')].append(sym)
+            if tail: tails.add(sym)
+        errors = {}
+        for start, syms in groups.items():
+            histories, errs = fetch_histories(syms, interval="1d", source=source, max_workers=max_workers,
+                                              timeout=timeout, cache=cache, start=start, timings=timings)
+            for sym, df in histories.items():
+                self.merge(sym, df, start)
+                # 다음 새로고침은 마지막 저장일부터 조회하므로, 방금 받은 꼬리를 그 키로도 캐시해 중복 조회 방지
+                dates = to_kst_dates(df.index)
+                last = dates[-1].strftime('%Y-%m-%d')
+                if cache is not None and last != start: cache.put((sym, f"{last}~", "1d"), df[dates >= dates[-1]])
+            # 마지막 저장일부터 받은 꼬리가 비어 있으면 새 봉이 없을 뿐 실패가 아님
+            errors.update({sym: err for sym, err in errs.items() if not (err == "empty" and sym in tails)})
+        return errors
+
+    def close_panel(self, symbols):
+        return close_panel({sym: df for sym in dict.fromkeys(symbols) if not (df := self.read(sym)).empty})
@@ -0,0 +1,107 @@
+# 포트폴리오 저장소: SQLite(WAL) 에 보유 종목과 예수금을 함께 보관
+# - 처음 열 때 기존 portfolio.csv / cash.txt 를 한 번만 가져옴
+# - 보유 종목(holdings)은 거래 원장(ledger.TradeLedger)이 거래마다 해당 행만 갱신하는 파생 표 → 여기서는 읽기만 함
+# - 거래와 예수금 변경을 transaction() 안에서 묶으면 원자적으로 반영
+import os
+import sqlite3
+from contextlib import contextmanager
+
+import pandas as pd
+
+from quotes import yf_symbol
+
+PORTFOLIO_COLS = ["종목명", "종목코드", "기준일", "평균매수가", "주식수", "익절기준"]
+_COLS_SQL = ", ".join(f'"{c}"' for c in PORTFOLIO_COLS)
+
+
+def _params(row):
+    # numpy 스칼라는 sqlite3 가 바인딩하지 못하므로 파이썬 값으로 변환
+    return [v.item() if hasattr(v, 'item') else v for v in (row[k] for k in PORTFOLIO_COLS)]
+
+
+def read_portfolio_csv(path):
+    df = pd.read_csv(path)
+    df['기준일'] = pd.to_datetime(df['기준일']).dt.strftime('%Y-%m-%d')
+    return df[PORTFOLIO_COLS]
+
+
+def read_cash_file(path):
+    try:
+        with open(path, "r") as f: return float(f.read())
+    except (OSError, ValueError):
+        return 0.0
+
+
+def since_by_ticker(portfolio):
+    # {야후 티커: 해당 티커 보유분 중 가장 이른 기준일}
+    if portfolio.empty: return {}
+    ref = pd.Series(pd.to_datetime(portfolio['기준일']).values, index=portfolio['종목코드'].map(yf_symbol).values)
+    return ref.groupby(level=0).min().to_dict()
+
+
+class PortfolioStore:
+    def __init__(self, path="portfolio.db", csv_path="portfolio.csv", cash_path="cash.txt"):
+        self.path = path
+        conn = self._connect()
+        try: conn.execute("PRAGMA journal_mode=WAL")  # 트랜잭션 밖에서만 전환 가능, DB 파일에 유지됨
+        finally: conn.close()
+        with self.transaction() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS holdings (id INTEGER PRIMARY KEY AUTOINCREMENT, "종목명" TEXT NOT NULL, '
+                         '"종목코드" TEXT NOT NULL, "기준일" TEXT NOT NULL, "평균매수가" REAL NOT NULL, "주식수" INTEGER NOT NULL, "익절기준" REAL NOT NULL)')
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)")
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'csv_imported'").fetchone() is None:
+                self._import_legacy(conn, csv_path, cash_path)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout = 10000")
+        return conn
+
+    @contextmanager
+    def transaction(self, conn=None):
+        # 바깥 트랜잭션이 있으면 그대로 사용, 없으면 새로 열어 끝에서 commit (예외 시 rollback)
+        if conn is not None:
+            yield conn; return
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _import_legacy(self, conn, csv_path, cash_path):
+        if csv_path and os.path.exists(csv_path):
+            df = read_portfolio_csv(csv_path)
+            conn.executemany(f"INSERT INTO holdings ({_COLS_SQL}) VALUES (?, ?, ?, ?, ?, ?)", (_params(r) for _, r in df.iterrows()))
+        if cash_path and os.path.exists(cash_path):
+            self.save_cash(read_cash_file(cash_path), conn)
+        conn.execute("INSERT INTO meta (key, value) VALUES ('csv_imported', datetime('now'))")
+
+    def load(self):
+        conn = self._connect()
+        try:
+            df = pd.read_sql_query(f'SELECT id, {_COLS_SQL} FROM holdings WHERE "주식수" > 0 ORDER BY id', conn, index_col="id")
+        finally:
+            conn.close()
+        df.index.name = None
+        return df
+
+    def load_cash(self):
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'cash'").fetchone()
+        finally:
+            conn.close()
+        return float(row[0]) if row else 0.0
+
+    def save_cash(self, cash, conn=None):
+        with self.transaction(conn) as c:
+            c.execute("INSERT INTO meta (key, value) VALUES ('cash', ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value", (float(cash),))
+
+    def export_csv(self, path=None):
+        # path 가 없으면 CSV 문자열 반환 (기존 portfolio.csv 와 같은 형식)
+        return self.load().to_csv(path, index=False)
@@ -0,0 +1,57 @@
+# 시세 이력 캐시: st.session_state 밖(모듈 전역)에 두어 서버의 모든 세션이 공유
+# - 키: (종목, period, interval)
+# - 장중 또는 마감 직후(FINAL_AFTER 전)에 받은 데이터는 ttl 초 뒤 만료, 그 뒤에 받은 데이터는 다음 장 시작 전까지 유지
+#   (야후의 KRX 일봉은 지연되므로 15:30 직후 응답의 종가는 아직 확정값이 아님)
+# - 마감된 거래일 봉의 영구 보관은 OhlcvStore(종목별 Parquet)가 맡음. 이 캐시에는 조회 응답(대부분 마지막 저장일~오늘 꼬리)만 들어가므로
+#   완료된 봉도 함께 만료돼도 다시 받는 것은 꼬리뿐
+# - ttl 은 백그라운드 갱신 주기보다 짧아야 함 (같으면 주기마다 적중/만료가 엇갈림) → QuoteRefresher 가 장중 주기의 절반으로 제한
+# - maxsize 초과 시 가장 오래 안 쓴 항목부터 제거(LRU)
+import os
+import threading
+from collections import OrderedDict
+from datetime import time as dtime, timedelta
+
+from quotes import KRX_CLOSE, is_krx_open, kst_now, next_krx_open
+
+FINAL_AFTER = dtime(16, 0)  # 이 시각 이후(평일)에 받은 일봉만 당일 확정값으로 봄
+
+
+class PriceCache:
+    def __init__(self, ttl=60, maxsize=1024, clock=kst_now):
+        self.ttl, self.maxsize, self.clock = ttl, maxsize, clock
+        self.hits = self.misses = self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expires_at(self, fetched_at):
+        settling = fetched_at.weekday() < 5 and KRX_CLOSE <= fetched_at.time() < FINAL_AFTER
+        if is_krx_open(fetched_at) or settling: return fetched_at + timedelta(seconds=self.ttl)
+        return next_krx_open(fetched_at)
+
+    def get(self, key):
+        now = self.clock()
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] > now:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return item[1]
+            if item is not None: del self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (self._expires_at(self.clock()), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self._data)}
+
+
+# 프로세스 전역 공유 캐시 (Streamlit 재실행 시에도 모듈은 다시 import 되지 않음)
+SHARED = PriceCache(ttl=float(os.environ.get("PRICE_CACHE_TTL", 30)), maxsize=int(os.environ.get("PRICE_CACHE_SIZE", 1024)))
@@ -0,0 +1,138 @@
+# 시세 조회 계층: 보유 종목 전체를 한 번에 병렬로 받아 종가 패널 하나로 정렬
+import concurrent.futures as cf
+import threading
+import time
+from collections import deque
+from datetime import time as dtime, timedelta
+
+import pandas as pd
+
+KST = 'Asia/Seoul'
+KRX_OPEN, KRX_CLOSE = dtime(9, 0), dtime(15, 30)
+
+
+def kst_now():
+    return pd.Timestamp.now(tz=KST).to_pydatetime()
+
+
+def is_krx_open(ts=None):
+    # 평일 09:00~15:30 (휴장일은 고려하지 않음)
+    ts = ts or kst_now()
+    return ts.weekday() < 5 and KRX_OPEN <= ts.time() < KRX_CLOSE
+
+
+def next_krx_open(ts=None):
+    ts = ts or kst_now()
+    nxt = ts.replace(hour=KRX_OPEN.hour, minute=KRX_OPEN.minute, second=0, microsecond=0)
+    if nxt <= ts: nxt += timedelta(days=1)
+    while nxt.weekday() >= 5: nxt += timedelta(days=1)
+    return nxt
+
+
+def yf_symbol(code):
+    # 접미사가 없는 코드는 코스피(.KS)로 간주 (기존 로직 유지)
+    code = str(code)
+    return code if "." in code else f"{code}.KS"
+
+
+YF_TIMEOUT = 5.0  # 요청 하나의 HTTP 제한(초): 멈춘 요청도 이 시간이 지나면 스레드를 돌려줌
+
+
+def yf_history(symbol, period="1mo", interval="1d", start=None):
+    # 수정주가(auto_adjust) 없이 실제 체결 종가: 로컬 저장소는 꼬리만 덧붙이므로 배당 때마다 과거가 다시 조정되는 값을 섞으면 안 됨
+    # (평균매수가도 실제 체결가라 고점/수익률 비교 기준이 같음)
+    import yfinance as yf
+    if start is not None:
+        return yf.Ticker(symbol).history(start=start, interval=interval, auto_adjust=False, timeout=YF_TIMEOUT)
+    return yf.Ticker(symbol).history(period=period, interval=interval, auto_adjust=False, timeout=YF_TIMEOUT)
+
+
+def timed(source, timings):
+    # 종목별 조회 소요시간(초)을 timings[종목] 에 기록하는 source 래퍼
+    def call(sym, **kwargs):
+        t0 = time.perf_counter()
+        try: return source(sym, **kwargs)
+        finally: timings[sym] = time.perf_counter() - t0
+    return call
+
+
+def run_calls(calls, max_workers, timeout, stall=None):
+    # {키: 인자 없는 함수} 를 요청마다 스레드 하나로 최대 max_workers 개씩 동시에 실행, {키: Future} 반환 (timeout 초 안에 못 끝난 것은 미완료)
+    # 실행 중인 요청은 취소할 수 없으므로, stall 초(기본 timeout/3) 넘게 안 끝난 요청은 '잃은 작업자'로 보고 동시 실행 수에서 빼 자리를 채움
+    # → 멈춘 요청이 자리를 모두 차지해도 같은 호출/다음 호출의 정상 종목은 계속 진행. 멈춘 스레드는 요청이 끝나면(YF_TIMEOUT) 종료
+    stall = timeout / 3 if stall is None else stall
+    futures = {k: cf.Future() for k in calls}
+    pending, started, cond = deque(calls), {}, threading.Condition()
+
+    def work(key, fn):
+        try: futures[key].set_result(fn())
+        except BaseException as e: futures[key].set_exception(e)
+        with cond: started.pop(key, None); cond.notify()
+
+    deadline = time.monotonic() + timeout
+    with cond:
+        while pending and (now := time.monotonic()) < deadline:
+            active = sum(now - t < stall for t in started.values())
+            while pending and active < max_workers:
+                key = pending.popleft()
+                started[key] = now
+                threading.Thread(target=work, args=(key, calls[key]), name=f"quotes-{key}", daemon=True).start()
+                active += 1
+            if pending: cond.wait(min(deadline - now, stall / 4 or deadline - now))
+    cf.wait(futures.values(), timeout=max(0.0, deadline - time.monotonic()))
+    return futures
+
+
+def fetch_histories(symbols, period="1mo", interval="1d", source=yf_history, max_workers=8, timeout=10.0, cache=None, start=None, timings=None):
+    # 종목별 history 호출을 동시에 실행(run_calls), 전체 timeout(초) 안에 끝나지 않은 종목과 실패는 errors 로 수집
+    # cache(PriceCache)가 주어지면 (종목, period, interval) 적중분은 네트워크 없이 바로 사용
+    # start(YYYY-MM-DD)가 주어지면 period 대신 해당 일자부터 조회 (캐시 키의 period 자리는 "start~")
+    # timings(dict)가 주어지면 실제 조회한 종목별 소요시간 기록
+    symbols = list(dict.fromkeys(symbols))
+    histories, errors = {}, {}
+    key_period = period if start is None else f"{start}~"
+    if cache is not None:
+        for sym in symbols:
+            df = cache.get((sym, key_period, interval))
+            if df is not None: histories[sym] = df
+        symbols = [sym for sym in symbols if sym not in histories]
+    if not symbols: return histories, errors
+    if timings is not None: source = timed(source, timings)
+    # 종목별로 차례로 기다리면 최악 N x timeout 이 되므로 마감 시각 하나로 한 번에 기다림
+    futures = run_calls({sym: (lambda sym=sym: source(sym, period=period, interval=interval, start=start)) for sym in symbols}, max_workers, timeout)
+    for sym, fut in futures.items():
+        if not fut.done():
+            errors[sym] = "timeout"; continue
+        try:
+            df = fut.result()
+            if df is not None and not df.empty:
+                histories[sym] = df
+                if cache is not None: cache.put((sym, key_period, interval), df)
+            else: errors[sym] = "empty"
+        except Exception as e:
+            errors[sym] = f"{type(e).__name__}: {e}"
+    return histories, errors
+
+
+def to_kst_dates(index):
+    # tz 가 있으면 KST 로 변환, 없으면 KST 로 간주한 뒤 자정 기준 날짜로 정규화
+    idx = pd.DatetimeIndex(index)
+    idx = idx.tz_convert(KST) if idx.tz is not None else idx.tz_localize(KST)
+    return idx.normalize()
+
+
+def close_panel(histories):
+    # {종목: OHLCV} -> 날짜 x 종목 종가 패널 (거래일이 다른 종목은 NaN)
+    if not histories: return pd.DataFrame(dtype=float)
+    cols = {}
+    for sym, df in histories.items():
+        s = df['Close'].copy()
+        s.index = to_kst_dates(s.index)
+        cols[sym] = s[~s.index.duplicated(keep='last')]
+    # copy() 로 단일 float 블록으로 합쳐 두면 이후 to_numpy() 가 복사 없이 끝남
+    return pd.concat(cols, axis=1).sort_index().astype(float).copy()
+
+
+def fetch_close_panel(symbols, period="1mo", interval="1d", source=yf_history, max_workers=8, timeout=10.0, cache=None):
+    histories, errors = fetch_histories(symbols, period, interval, source, max_workers, timeout, cache)
+    return close_panel(histories), errors
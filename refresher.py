@@ -0,0 +1,128 @@
+# 백그라운드 시세 갱신 작업자: 페이지 렌더링과 분리해 주기적으로 시세를 받아 공유 스냅샷으로 게시
+# - 화면은 기다리지 않고 최신 스냅샷(갱신 시각 포함)으로 바로 그림
+# - 장중(KRX 09:00~15:30)에는 open_interval, 장 마감 후에는 closed_interval 주기로 갱신
+# - 종목별 실패는 숨기지 않고 failures 에 기록 (오류 내용, 연속 실패 횟수, 마지막 시각)
+# - listeners: 새 스냅샷이 게시될 때마다 호출 (신호 엔진 등)
+# - snapshot_path: 마지막 스냅샷을 파일로 남겨 두고, 다음 시작 시 첫 갱신 전까지 그 값으로 바로 그림(warm=True)
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from quotes import KST, is_krx_open, kst_now, yf_history
+from symbols import atomic_replace
+from timing import RUNS, RunTimer
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    closes: pd.DataFrame
+    refreshed_at: object  # KST datetime
+    duration: float
+    errors: dict = field(default_factory=dict)
+    warm: bool = False  # 이전 실행에서 저장한 스냅샷
+
+    def age(self, now=None):
+        return ((now or kst_now()) - self.refreshed_at).total_seconds()
+
+
+class QuoteRefresher:
+    def __init__(self, store, universe, cache=None, source=yf_history, open_interval=60, closed_interval=1800, timeout=10.0, timing_log=RUNS,
+                 snapshot_path=None):
+        # universe: {티커: 기준일 최솟값} 을 돌려주는 함수 (매 주기마다 호출해 보유 종목 변경 반영)
+        self.store, self.universe, self.cache, self.source = store, universe, cache, source
+        self.open_interval, self.closed_interval, self.timeout = open_interval, closed_interval, timeout
+        self.timing_log, self.snapshot_path = timing_log, snapshot_path
+        # 캐시 ttl 이 장중 갱신 주기 이상이면 주기마다 적중(직전 값 재사용)과 만료가 엇갈리므로 주기의 절반으로 제한
+        if cache is not None: cache.ttl = min(cache.ttl, open_interval / 2)
+        self.listeners = []
+        self.snapshot = self._load_snapshot()
+        self.failures = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def interval(self, now=None):
+        return self.open_interval if is_krx_open(now) else self.closed_interval
+
+    def run_once(self):
+        t0, timer = time.perf_counter(), RunTimer('refresh')
+        since = self.universe()
+        timer.lap('universe')
+        errors = self.store.update_many(since, source=self.source, timeout=self.timeout, cache=self.cache, timings=timer.tickers) if since else {}
+        timer.lap('update_store')
+        now = kst_now()
+        # 화면이 순회 중일 수 있으므로 제자리 수정 대신 새 dict 를 만들어 한 번에 교체 (스냅샷과 같은 방식)
+        prev, failures = self.failures, {}
+        for sym in since:
+            if sym in errors:
+                failures[sym] = {'error': errors[sym], 'count': prev[sym]['count'] + 1 if sym in prev else 1, 'at': now}
+                log.warning("시세 조회 실패 %s: %s", sym, errors[sym])
+        self.failures = failures
+        # 스냅샷은 통째로 교체하므로 읽는 쪽은 잠금 없이 항상 일관된 값을 봄
+        # 모든 세션이 공유하는 읽기 전용 패널 (float64 유지: 소수점 가격 종목도 있어 float32 로 줄이면 평가금액/수익률이 어긋남)
+        closes = self.store.close_panel(list(since))
+        timer.lap('close_panel')  # parquet 읽기 + KST 변환/정렬
+        self.snapshot = Snapshot(closes, now, time.perf_counter() - t0, errors)
+        self._save_snapshot(closes)
+        for listener in self.listeners:
+            try: listener(self.snapshot)
+            except Exception: log.exception("스냅샷 처리 실패 %r", listener)
+        timer.lap('listeners')
+        if self.timing_log is not None: self.timing_log.add(timer)
+        return self.snapshot
+
+    def _load_snapshot(self):
+        if not self.snapshot_path: return None
+        try:
+            closes = pd.read_parquet(self.snapshot_path)
+            at = pd.Timestamp(os.path.getmtime(self.snapshot_path), unit='s', tz=KST).to_pydatetime()
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        return Snapshot(closes, at, 0.0, warm=True)
+
+    def _save_snapshot(self, closes):
+        if not self.snapshot_path: return
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_path) or ".", exist_ok=True)
+            atomic_replace(self.snapshot_path, closes.to_parquet)
+        except OSError:
+            log.exception("스냅샷 저장 실패")
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                log.exception("시세 갱신 주기 실패")
+            self._wake.wait(self.interval())
+            self._wake.clear()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="quote-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def wake(self):
+        # 보유 종목 추가 등으로 즉시 갱신이 필요할 때
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set(); self._wake.set()
+
+    def closes(self, symbols):
+        # 스냅샷에 없는 종목(방금 추가 등)은 디스크 저장분으로 보충
+        snap = self.snapshot
+        have = snap.closes if snap is not None else pd.DataFrame(dtype=float)
+        missing = [s for s in dict.fromkeys(symbols) if s not in have.columns]
+        if not missing: return have
+        extra = self.store.close_panel(missing)
+        if extra.empty: return have
+        return extra if have.empty else have.join(extra, how='outer')
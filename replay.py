@@ -0,0 +1,89 @@
+# 녹화/재생 데이터 제공자: yf.Ticker().history 와 fdr.StockListing 응답을 로컬 fixture 파일로 저장해 두고 그대로 다시 돌려줌
+# - mode='record': 실제 호출 결과를 돌려주면서 fixture 에 합쳐 저장, mode='replay': fixture 만 사용 (네트워크 없음)
+# - 재생 시 period 는 오늘이 아니라 fixture 의 마지막 날짜 기준으로 잘라 항상 같은 결과
+# - latency(초) + jitter(초, 균등 분포) 지연과 error_rate 확률의 ConnectionError 를 주입
+#   주입 여부는 (seed, 요청 키, 같은 키의 호출 횟수) 로 정해지므로 스레드 실행 순서와 무관하게 재현됨
+# 사용: STOCK_QUOTE_SOURCE=record streamlit run test.py  (녹화) / STOCK_QUOTE_SOURCE=replay streamlit run test.py (재생)
+#       REPLAY_FIXTURES, REPLAY_LATENCY, REPLAY_JITTER, REPLAY_ERROR_RATE, REPLAY_SEED 환경 변수로 설정
+import os
+import threading
+import time
+import zlib
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from fake_feed import PERIOD_BARS
+from quotes import KST, to_kst_dates, yf_history
+from symbols import atomic_replace, fdr_listing
+
+
+class ReplayProvider:
+    def __init__(self, root="fixtures", mode="replay", latency=0.0, jitter=0.0, error_rate=0.0, seed=0, history_source=yf_history, listing_source=fdr_listing):
+        self.root, self.mode = root, mode
+        self.latency, self.jitter, self.error_rate, self.seed = latency, jitter, error_rate, seed
+        self.history_source, self.listing_source = history_source, listing_source
+        self.calls = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, mode="replay", **kw):
+        env = os.environ.get
+        return cls(env("REPLAY_FIXTURES", "fixtures"), mode, float(env("REPLAY_LATENCY", 0)), float(env("REPLAY_JITTER", 0)),
+                   float(env("REPLAY_ERROR_RATE", 0)), int(env("REPLAY_SEED", 0)), **kw)
+
+    def history_path(self, symbol, interval="1d"):
+        return os.path.join(self.root, "history", f"{symbol.replace('/', '_')}_{interval}.parquet")
+
+    def listing_path(self, kind):
+        return os.path.join(self.root, "listing", f"{kind.replace('/', '_')}.parquet")
+
+    def _inject(self, key):
+        # 지연 후 error_rate 확률로 실패
+        with self._lock:
+            self.calls[key] += 1
+            n = self.calls[key]
+        rng = np.random.default_rng([self.seed, zlib.crc32(key.encode()), n])
+        delay = self.latency + (rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0: time.sleep(delay)
+        if self.error_rate and rng.random() < self.error_rate:
+            raise ConnectionError(f"injected failure ({key} #{n})")
+
+    @staticmethod
+    def _write(path, df):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_replace(path, df.to_parquet)
+
+    def save_history(self, symbol, df, interval="1d"):
+        # 기존 fixture 와 합쳐 저장 (겹치는 날은 새 값 우선)
+        df = df.copy()
+        df.index = to_kst_dates(df.index)
+        path = self.history_path(symbol, interval)
+        with self._lock:
+            if os.path.exists(path): df = pd.concat([pd.read_parquet(path), df])
+            self._write(path, df[~df.index.duplicated(keep='last')].sort_index())
+
+    def save_listing(self, kind, df):
+        with self._lock: self._write(self.listing_path(kind), df.reset_index(drop=True))
+
+    def history(self, symbol, period="1mo", interval="1d", start=None):
+        # quotes.yf_history 와 같은 인자/반환 형태
+        self._inject(f"history:{symbol}")
+        if self.mode == "record":
+            df = self.history_source(symbol, period=period, interval=interval, start=start)
+            if df is not None and not df.empty: self.save_history(symbol, df, interval)
+            return df
+        df = pd.read_parquet(self.history_path(symbol, interval))
+        if start is not None: return df[df.index >= pd.Timestamp(start, tz=KST)]
+        if period in PERIOD_BARS: return df.iloc[-PERIOD_BARS[period]:]
+        return df
+
+    def listing(self, kind):
+        # symbols.fdr_listing 과 같은 인자/반환 형태
+        self._inject(f"listing:{kind}")
+        if self.mode == "record":
+            df = self.listing_source(kind)
+            self.save_listing(kind, df)
+            return df
+        return pd.read_parquet(self.listing_path(kind))
@@ -0,0 +1,81 @@
+# 종목명 검색 인덱스: 이름/초성 2-gram 역색인 + 종목코드 정렬 목록으로 질의당 상위 N개만 반환
+# - "삼성" 처럼 일반 검색어는 이름(공백 무시, 대소문자 무시) 부분 일치
+# - "ㅅㅅㅈㅈ" 처럼 초성만 입력하면 초성 문자열에서 부분 일치
+# - "0059" 처럼 숫자로만 된 검색어는 종목코드 앞자리 일치 + 이름 부분 일치("200" → KODEX 200)를 번갈아 합침
+#   ("1Q", "3s" 처럼 숫자로 시작해도 문자가 섞이면 이름 검색)
+# - 프로세스 전체가 공유하는 읽기 전용 구조: 역색인 목록은 정렬된 int32 배열, 종목코드는 정렬된 배열로 보관
+import heapq
+from collections import defaultdict
+
+import numpy as np
+
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+
+
+def normalize(text):
+    return "".join(str(text).lower().split())
+
+
+def chosung(text):
+    # 한글 음절은 초성으로, 나머지 문자는 그대로
+    return "".join(CHOSUNG[(ord(c) - 0xAC00) // 588] if "가" <= c <= "힣" else c for c in normalize(text))
+
+
+def is_chosung(text):
+    return bool(text) and all(c in CHOSUNG for c in text)
+
+
+_EMPTY = np.zeros(0, dtype=np.int32)
+
+
+def _grams(text):
+    return {text[i:i + 2] for i in range(len(text) - 1)} or {text}
+
+
+class SymbolSearch:
+    def __init__(self, names, symbols):
+        self.names, self.symbols = list(names), list(symbols)
+        self.keys = [normalize(n) for n in self.names]
+        self.cho = [chosung(n) for n in self.names]
+        self.name_grams, self.cho_grams = self._build(self.keys), self._build(self.cho)
+        codes = np.array([s.split(".")[0] for s in self.symbols], dtype=str)
+        self.code_order = np.argsort(codes, kind='stable').astype(np.int32)
+        self.codes = codes[self.code_order]
+
+    @staticmethod
+    def _build(keys):
+        # 1-gram 도 함께 넣어 한 글자 검색어 지원. 집합 대신 정렬된 int32 배열로 보관해 메모리 절약
+        postings = defaultdict(list)
+        for i, k in enumerate(keys):
+            for g in _grams(k) | set(k): postings[g].append(i)
+        return {g: np.array(ids, dtype=np.int32) for g, ids in postings.items()}
+
+    @staticmethod
+    def _candidates(postings, q):
+        arrays = sorted((postings.get(g, _EMPTY) for g in _grams(q)), key=len)
+        if not arrays: return _EMPTY
+        ids = arrays[0]
+        for a in arrays[1:]: ids = np.intersect1d(ids, a, assume_unique=True)
+        return ids
+
+    def query(self, text, limit=20):
+        # 정렬: 완전 일치 > 앞부분 일치 > 부분 일치, 같은 순위는 짧은 이름 먼저
+        q = normalize(text)
+        if not q: return []
+        keys, postings = (self.cho, self.cho_grams) if is_chosung(q) else (self.keys, self.name_grams)
+        ids = [i for i in self._candidates(postings, q).tolist() if q in keys[i]]
+        ids = heapq.nsmallest(limit, ids, key=lambda i: (keys[i] != q, not keys[i].startswith(q), len(keys[i]), self.names[i]))
+        hits = [self.names[i] for i in ids]
+        if not q.isdigit(): return hits
+        # 숫자만 입력: 코드 일치와 이름 일치를 번갈아 (한쪽이 상위 N개를 모두 차지하지 않도록)
+        codes = self._code_prefix(q, limit)
+        merged = [n for pair in zip(codes, hits) for n in pair] + codes[len(hits):] + hits[len(codes):]
+        return list(dict.fromkeys(merged))[:limit]
+
+    def _code_prefix(self, q, limit):
+        lo = int(np.searchsorted(self.codes, q))
+        hits = []
+        for code, i in zip(self.codes[lo:lo + limit].tolist(), self.code_order[lo:lo + limit].tolist()):
+            if not code.startswith(q): break
+            hits.append(self.names[i])
+        return hits
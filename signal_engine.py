@@ -0,0 +1,181 @@
+# 증분 신호 엔진: 보유 종목별 기준일 이후 고점과 마지막 신호 상태를 들고 있다가 새 시세마다 O(1) 로 갱신
+# - 이력 재계산은 보유 종목이 바뀔 때(추가/수정/삭제) 한 번만 (valuation.evaluate 로 초기화)
+# - 신호가 바뀐 종목만 SignalEvent 로 만들어 등록된 싱크(로그 파일, 웹훅, 화면 토스트)에 전달
+# - 판정 규칙은 valuation.signal_masks 와 동일
+# - 고점 = max(마감된 봉의 고점, 현재가): 당일 봉은 장중에 계속 바뀌므로 마감 전에는 고점에 누적하지 않음 (evaluate 의 '고점' 과 같은 값)
+#   새 거래일 봉이 들어오면 이력으로 다시 초기화해 전날 종가를 마감 봉으로 반영
+import json
+import logging
+import queue
+import threading
+import urllib.request
+from collections import deque
+from dataclasses import asdict, dataclass
+
+import numpy as np
+import pandas as pd
+
+from quotes import KST, kst_now, yf_symbol
+from valuation import SIGNAL_STYLE, evaluate, signal_masks
+
+log = logging.getLogger(__name__)
+
+SIGNALS = list(SIGNAL_STYLE)  # 상태 코드 -> 신호 (0 = HOLD)
+
+
+def closed_high(valued, closes):
+    # 종목별 현재(마지막) 봉을 뺀 마감 봉들의 고점. evaluate 와 같은 규칙: 현재 봉이 기준일 이후면 기준일 이후 봉만, 아니면 전체 구간
+    col = pd.Index(closes.columns).get_indexer(valued['종목코드'].map(yf_symbol))
+    X = closes.to_numpy(dtype=float)[:, col]
+    valid = ~np.isnan(X)
+    n = X.shape[0]
+    last = n - 1 - np.argmax(valid[::-1], axis=0)
+    closed = valid & (np.arange(n)[:, None] < last[None, :])
+    dates = pd.DatetimeIndex(closes.index).as_unit('ns').asi8
+    ref = pd.DatetimeIndex(pd.to_datetime(valued['기준일'], format='%Y-%m-%d')).tz_localize(KST).as_unit('ns').asi8
+    use = np.where((dates[last] >= ref)[None, :], closed & (dates[:, None] >= ref[None, :]), closed)
+    mx = np.where(use, X, -np.inf).max(axis=0)
+    return np.where(np.isinf(mx), np.nan, mx)
+
+
+def last_prices(closes):
+    # 종목별 마지막 유효 종가: 마지막 행만 보고, 그 행이 빈 종목만 따로 찾음 (패널 전체 ffill 없이)
+    last = closes.iloc[-1].astype(float)
+    for col in last.index[last.isna()]:
+        i = closes[col].last_valid_index()
+        if i is not None: last[col] = closes.at[i, col]
+    return last
+
+
+@dataclass(frozen=True, slots=True)
+class SignalEvent:
+    id: object  # 보유 종목 행 id
+    name: str
+    ticker: str
+    prev: str
+    signal: str
+    price: float
+    high: float
+    p_rate: float
+    at: str  # KST ISO 시각
+
+    def message(self):
+        return f"{self.name} {SIGNAL_STYLE[self.signal][0]} · 현재가 {self.price:,.0f}원 ({self.p_rate:+.1f}%) · 고점 {self.high:,.0f}원"
+
+
+class SignalEngine:
+    def __init__(self, sinks=(), stop_pct=-10.0, add_pct=50.0):
+        self.sinks, self.stop_pct, self.add_pct = list(sinks), stop_pct, add_pct
+        self.holdings_key = None
+        self.ids, self.names, self.tickers = np.array([]), np.array([], dtype=object), np.array([], dtype=object)
+        self.avg, self.take, self.base, self.high, self.curr = (np.array([]) for _ in range(5))
+        self.day = None  # 초기화에 쓴 패널의 마지막 봉 날짜
+        self.state = np.zeros(0, dtype=np.int8)
+        self._rows = {}
+        self._lock = threading.Lock()
+
+    def sync(self, portfolio, closes):
+        # 보유 종목(또는 시세가 있는 종목)이 바뀌었을 때만 이력으로 고점/상태 초기화
+        # 내용이 그대로인 행은 마지막 신호를 이어받아, 이후 바뀔 때만 알림
+        h = int(pd.util.hash_pandas_object(portfolio, index=True).sum()) if len(portfolio) else 0
+        key = (h, frozenset(closes.columns))
+        if key == self.holdings_key: return False
+        valued = evaluate(portfolio, closes, self.stop_pct, self.add_pct)
+        rows = dict(zip(portfolio.index, portfolio.itertuples(index=False, name=None)))
+        with self._lock:
+            prev = {i: s for i, s in zip(self.ids.tolist(), self.state.tolist()) if self._rows.get(i) == rows.get(i)}
+            self.ids, self.names = valued.index.to_numpy(), valued['종목명'].to_numpy(dtype=object)
+            self.tickers = valued['종목코드'].map(yf_symbol).to_numpy(dtype=object)
+            self.avg, self.take = valued['평균매수가'].to_numpy(dtype=float), valued['익절기준'].to_numpy(dtype=float)
+            self.high, self.curr = valued['고점'].to_numpy(dtype=float), valued['현재가'].to_numpy(dtype=float)
+            self.base = closed_high(valued, closes) if len(valued) else np.array([])
+            self.day = closes.index[-1] if len(closes) else None
+            seeded = valued['신호'].map(SIGNALS.index).tolist()
+            self.state = np.array([prev.get(i, s) for i, s in zip(self.ids.tolist(), seeded)], dtype=np.int8)
+            self._rows, self.holdings_key = rows, key
+        return True
+
+    def tick(self, prices, at=None):
+        # prices: {티커: 현재가} 또는 Series. 보유 종목마다 고점/현재가를 갱신하고 신호가 바뀐 종목의 이벤트 반환
+        prices = pd.Series(prices, dtype=float)
+        with self._lock:
+            if not len(self.ids): return []
+            p = prices.reindex(self.tickers).to_numpy(dtype=float)
+            ok = ~np.isnan(p)
+            self.curr = np.where(ok, p, self.curr)
+            self.high = np.where(ok, np.fmax(self.base, p), self.high)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                p_rate = np.where(self.avg > 0, (self.curr - self.avg) / self.avg * 100, 0.0)
+            new = np.select(signal_masks(p_rate, self.curr, self.high, self.take, self.stop_pct, self.add_pct), [1, 2, 3], 0).astype(np.int8)
+            moved = np.flatnonzero(ok & (new != self.state))
+            at = (at or kst_now()).isoformat()
+            ids = self.ids.tolist() if len(moved) else []
+            events = [SignalEvent(ids[i], self.names[i], self.tickers[i], SIGNALS[self.state[i]], SIGNALS[new[i]],
+                                  float(self.curr[i]), float(self.high[i]), float(p_rate[i]), at) for i in moved]
+            self.state = np.where(ok, new, self.state).astype(np.int8)
+        if events: self.emit(events)
+        return events
+
+    def on_snapshot(self, portfolio, closes):
+        # 백그라운드 갱신 결과(종가 패널)로 동기화 후 마지막 종가로 한 틱 진행
+        # 마지막 봉 날짜가 바뀌면(새 거래일) 전날 봉이 마감됐으므로 이력으로 다시 초기화
+        if closes.empty: return []
+        if closes.index[-1] != self.day: self.holdings_key = None
+        self.sync(portfolio, closes)
+        return self.tick(last_prices(closes))
+
+    def emit(self, events):
+        for sink in self.sinks:
+            try: sink(events)
+            except Exception: log.exception("신호 싱크 실패 %r", sink)
+
+
+class LogSink:
+    # 이벤트를 JSON lines 파일에 추가
+    def __init__(self, path):
+        self.path = path
+
+    def __call__(self, events):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(asdict(e), ensure_ascii=False, default=str) + "\n" for e in events)
+
+
+class WebhookSink:
+    # 이벤트 묶음을 JSON 으로 POST (url 이 없으면 보낼 내용만 보관하는 스텁)
+    # 시세 갱신 리스너 안에서 호출되므로 전송은 큐에 넣고 전용 스레드가 차례로 보냄 (느린/멈춘 웹훅이 갱신 주기를 막지 않음)
+    def __init__(self, url=None, timeout=5.0, maxsize=100):
+        self.url, self.timeout, self.sent = url, timeout, deque(maxlen=100)
+        self.queue = queue.Queue(maxsize)
+        if url: threading.Thread(target=self._worker, name="signal-webhook", daemon=True).start()
+
+    def __call__(self, events):
+        body = json.dumps({'events': [asdict(e) for e in events]}, ensure_ascii=False, default=str).encode()
+        self.sent.append(body)
+        if self.url:
+            try: self.queue.put_nowait(body)
+            except queue.Full: log.warning("웹훅 전송 대기열이 가득 차 이벤트 %d건을 버림", len(events))
+
+    def _worker(self):
+        while True:
+            body = self.queue.get()
+            try:
+                req = urllib.request.Request(self.url, data=body, headers={'Content-Type': 'application/json'})
+                urllib.request.urlopen(req, timeout=self.timeout).close()
+            except Exception: log.exception("웹훅 전송 실패 %s", self.url)
+
+
+class ToastSink:
+    # 화면 토스트용 이벤트 버퍼: 세션마다 마지막으로 본 번호 이후 이벤트를 가져감 (st.toast 는 세션 스레드에서 호출)
+    def __init__(self, maxlen=200):
+        self.events, self.seq = deque(maxlen=maxlen), 0
+        self._lock = threading.Lock()
+
+    def __call__(self, events):
+        with self._lock:
+            for e in events:
+                self.seq += 1
+                self.events.append((self.seq, e))
+
+    def since(self, seq):
+        # (seq 이후 이벤트 목록, 최신 번호)
+        with self._lock: return [e for s, e in self.events if s > seq], self.seq
@@ -0,0 +1,123 @@
+# 종목 목록(이름 -> 야후 티커) 인덱스: 벡터 연산으로 만들어 로컬에 버전/날짜와 함께 저장
+# - 시작 시 저장본을 바로 읽고(수 ms), 날짜가 지났으면 백그라운드에서 하루 한 번 재생성
+# - 목록 조회가 실패하면 마지막 정상 저장본을 계속 사용 (저장본도 없을 때만 하드코딩 목록)
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from search import SymbolSearch
+
+INDEX_VERSION = 1
+SYMBOLS_FILE = os.path.join("data", "symbols.parquet")
+META_FILE = os.path.join("data", "symbols.json")
+FALLBACK = {"삼성전자": "005930.KS", "SK하이닉스": "000660.KS"}
+RETRY_SEC = 600  # 재생성 실패 후 다시 시도하기까지 최소 간격
+
+
+def fdr_listing(kind):
+    import FinanceDataReader as fdr
+    return fdr.StockListing(kind)
+
+
+def build_index(listing=fdr_listing):
+    # KRX: 시장 구분으로 .KS / .KQ 접미사, ETF: 모두 .KS. 같은 이름이면 ETF 가 우선(기존 dict 덮어쓰기 순서)
+    # 목록 하나라도 실패/비어 있으면 예외 → 일부가 빠진 인덱스를 저장하지 않고 이전 저장본 유지 (SymbolIndex.refresh)
+    krx, etf = listing('KRX'), listing('ETF/KR')
+    for kind, df in (('KRX', krx), ('ETF/KR', etf)):
+        if df is None or df.empty: raise ValueError(f"{kind} 종목 목록이 비어 있음")
+    suffix = np.select([krx['Market'] == 'KOSPI', krx['Market'] == 'KOSDAQ'], ['.KS', '.KQ'], '')
+    parts = [pd.DataFrame({'Name': krx['Name'].astype(str), 'Symbol': krx['Code'].astype(str) + suffix}),
+             pd.DataFrame({'Name': etf['Name'].astype(str), 'Symbol': etf['Symbol'].astype(str) + '.KS'})]
+    df = pd.concat(parts, ignore_index=True).drop_duplicates('Name', keep='last')
+    return df.sort_values('Name', ignore_index=True)
+
+
+def atomic_replace(path, write):
+    # 같은 폴더의 고유 임시 파일에 쓴 뒤 교체 (여러 프로세스가 동시에 써도 임시 파일이 겹치지 않음)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp): os.remove(tmp)
+        raise
+
+
+def write_json(obj):
+    def write(p):
+        with open(p, "w") as f: json.dump(obj, f)
+    return write
+
+
+def save_index(df, built=None, path=SYMBOLS_FILE, meta_path=META_FILE):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    atomic_replace(path, df.to_parquet)
+    meta = {'version': INDEX_VERSION, 'date': (built or date.today()).isoformat(), 'count': len(df)}
+    atomic_replace(meta_path, write_json(meta))
+    return meta
+
+
+def load_index(path=SYMBOLS_FILE, meta_path=META_FILE):
+    # (DataFrame, meta) 또는 저장본이 없거나 버전이 다르면 (None, None)
+    try:
+        with open(meta_path) as f: meta = json.load(f)
+        if meta.get('version') != INDEX_VERSION: return None, None
+        return pd.read_parquet(path), meta
+    except (FileNotFoundError, ValueError, OSError):
+        return None, None
+
+
+class SymbolIndex:
+    def __init__(self, listing=fdr_listing, path=SYMBOLS_FILE, meta_path=META_FILE):
+        self.listing, self.path, self.meta_path = listing, path, meta_path
+        self.df, self.meta, self.error = None, None, None
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._last_attempt = float("-inf")
+
+    def _set(self, df, meta):
+        self.df, self.meta = df, meta
+        self.stocks = dict(zip(df['Name'], df['Symbol']))
+        self.names = df['Name'].tolist()
+        self.search = SymbolSearch(self.names, df['Symbol'])
+
+    def refresh(self):
+        try:
+            df = build_index(self.listing)
+            meta = save_index(df, path=self.path, meta_path=self.meta_path)
+            with self._lock: self._set(df, meta); self.error = None
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+        finally:
+            self._refreshing = False
+
+    def refresh_in_background(self):
+        with self._lock:
+            if self._refreshing or time.monotonic() - self._last_attempt < RETRY_SEC: return
+            self._refreshing, self._last_attempt = True, time.monotonic()
+        threading.Thread(target=self.refresh, name="symbol-index-refresh", daemon=True).start()
+
+    def get(self):
+        # 이름 -> 티커 dict. 처음 호출 시 저장본 로드
+        if self.df is None:
+            df, meta = load_index(self.path, self.meta_path)
+            if df is not None:
+                with self._lock: self._set(df, meta)
+            else:
+                # 저장본이 없으면 기본 목록으로 먼저 그리고 아래에서 백그라운드 생성 (첫 화면을 목록 조회로 막지 않음)
+                fb = pd.DataFrame({'Name': list(FALLBACK), 'Symbol': list(FALLBACK.values())})
+                with self._lock: self._set(fb, None)
+        if self.meta is None or self.meta['date'] < date.today().isoformat():
+            self.refresh_in_background()
+        return self.stocks
+
+
+# 프로세스 전역 공유 인덱스
+INDEX = SymbolIndex()
@@ -1,10 +1,25 @@
 import streamlit as st
-import FinanceDataReader as fdr
-import yfinance as yf
 import pandas as pd
 import os
 from datetime import datetime, date
-import plotly.express as px
+from quotes import yf_symbol, yf_history
+from ohlcv_store import OhlcvStore
+from refresher import QuoteRefresher
+from live import LiveValuation
+from fake_feed import FakeQuoteFeed
+from monitor_table import render_rows, render_table
+from symbols import INDEX, SymbolIndex
+from replay import ReplayProvider
+from price_cache import SHARED as price_cache
+from portfolio_store import PortfolioStore, since_by_ticker
+from timing import RUNS, RunProfiler, RunTimer
+from nav import NavHistory
+from signal_engine import LogSink, SignalEngine, ToastSink, WebhookSink
+from ledger import TradeLedger
+
+# [개선 반영] 단계별 실행 시간 계측 (하단 '성능 계측' 패널), 요청 시 한 번의 실행만 프로파일링
+page_timer = RunTimer('page')
+page_profiler = RunProfiler().start() if st.session_state.pop('profile_next_run', False) else None
 
 # 1. 페이지 설정 및 디자인 주입
 st.set_page_config(page_title="김팀장님의 주식관리 시스템 V2", layout="wide")
@@ -54,188 +69,265 @@ st.markdown("""
     .reportview-container .main .block-container { padding-top: 2rem; }
     </style>
     """, unsafe_allow_html=True)
+page_timer.lap('page_setup')
 
-# 2. 데이터 관리 함수 (유지)
+# 2. 데이터 관리 함수
+# [개선 반영] CSV 전체 재작성 대신 SQLite(WAL) 저장소에 행 단위로 반영, 최초 실행 시 CSV/cash.txt 1회 이관
 DB_FILE = "portfolio.csv"
 CASH_FILE = "cash.txt"
 
-def load_data():
-    if os.path.exists(DB_FILE): 
-        df = pd.read_csv(DB_FILE)
-        df['기준일'] = pd.to_datetime(df['기준일']).dt.strftime('%Y-%m-%d')
-        return df
-    return pd.DataFrame(columns=["종목명", "종목코드", "기준일", "평균매수가", "주식수", "익절기준"])
-
-def save_data(df): df.to_csv(DB_FILE, index=False)
-
-def load_cash():
-    if os.path.exists(CASH_FILE):
-        with open(CASH_FILE, "r") as f:
-            try: return float(f.read())
-            except: return 0.0
-    return 0.0
-
-def save_cash(cash):
-    with open(CASH_FILE, "w") as f: f.write(str(cash))
-
-# [개선 반영] KRX 접속 에러 방지 및 코스피/코스닥 구분 로직 강화
-@st.cache_data
-def get_stock_list():
-    try:
-        df_krx = fdr.StockListing('KRX')
-        # Market 정보를 함께 가져와서 .KS / .KQ 구분 기반 마련
-        stocks = {}
-        for _, row in df_krx.iterrows():
-            code = row['Code']
-            suffix = ".KS" if row['Market'] == 'KOSPI' else ".KQ" if row['Market'] == 'KOSDAQ' else ""
-            stocks[row['Name']] = f"{code}{suffix}"
-    except:
-        stocks = {"삼성전자": "005930.KS", "SK하이닉스": "000660.KS"} 
-    
-    try:
-        df_etf = fdr.StockListing('ETF/KR')
-        for _, row in df_etf.iterrows():
-            stocks[row['Name']] = f"{row['Symbol']}.KS"
-    except: pass
-    return stocks
+@st.cache_resource
+def get_portfolio_store():
+    return PortfolioStore("portfolio.db", csv_path=DB_FILE, cash_path=CASH_FILE)
+
+portfolio_store = get_portfolio_store()
+
+# [개선 반영] 매수/매도는 추가 전용 거래 원장에 기록, 보유 종목 표(holdings)는 거래마다 해당 행만 갱신되는 파생 포지션
+@st.cache_resource
+def get_trade_ledger():
+    return TradeLedger(portfolio_store)
+
+trade_ledger = get_trade_ledger()
+
+def load_data(): return portfolio_store.load()
+
+def load_cash(): return portfolio_store.load_cash()
+
+def save_cash(cash): portfolio_store.save_cash(cash)
+
+# STOCK_QUOTE_SOURCE=fake 이면 네트워크 대신 로컬 가짜 피드 사용
+# [개선 반영] STOCK_QUOTE_SOURCE=replay/record 이면 시세/종목 목록을 fixture 에서 재생/녹화 (replay.py, 지연/오류 주입 가능)
+# 두 모드 모두 캐시 없이 LIVE_REFRESH_SEC 주기로 갱신
+# 실제 시세가 아닌 모드는 data/ 아래 별도 파일(ohlcv_fake, snapshot_replay.parquet 등) 사용
+QUOTE_SOURCE = os.environ.get("STOCK_QUOTE_SOURCE", "yahoo")
+LIVE_REFRESH_SEC = int(os.environ.get("LIVE_REFRESH_SEC", 10))
+DATA_TAG = {"fake": "_fake", "replay": "_replay", "record": "_replay"}.get(QUOTE_SOURCE, "")
+
+@st.cache_resource
+def get_replay():
+    return ReplayProvider.from_env(QUOTE_SOURCE) if QUOTE_SOURCE in ("replay", "record") else None
+
+replay = get_replay()
+
+# [개선 반영] 종목 목록은 로컬 저장본(버전/날짜 포함)에서 즉시 로드, 하루 한 번 백그라운드 갱신
+# 목록 조회 실패 시 마지막 정상 저장본 유지
+@st.cache_resource
+def get_symbol_index():
+    if replay is None: return INDEX
+    return SymbolIndex(replay.listing, os.path.join("data", "symbols_replay.parquet"), os.path.join("data", "symbols_replay.json"))
+
+symbol_index = get_symbol_index()
+stock_dict = symbol_index.get()
+page_timer.lap('symbol_list')
 
-stock_dict = get_stock_list()
-stock_names = sorted(list(stock_dict.keys()))
+# [개선 반영] 시세는 백그라운드 작업자가 주기적으로 갱신, 화면은 최신 스냅샷으로 바로 렌더링
+@st.cache_resource
+def get_refresher():
+    universe = lambda: since_by_ticker(portfolio_store.load())
+    store = OhlcvStore(os.path.join("data", f"ohlcv{DATA_TAG}"))
+    # [개선 반영] 마지막 스냅샷을 저장해 두고 시작 직후에는 그 값으로 먼저 그림 (최신 시세는 백그라운드에서 채움)
+    snapshot_path = os.path.join("data", f"snapshot{DATA_TAG}.parquet")
+    if QUOTE_SOURCE == "fake":
+        return QuoteRefresher(store, universe, source=FakeQuoteFeed().history, open_interval=LIVE_REFRESH_SEC,
+                              closed_interval=LIVE_REFRESH_SEC, snapshot_path=snapshot_path).start()
+    if replay is not None:
+        return QuoteRefresher(store, universe, source=replay.history, open_interval=LIVE_REFRESH_SEC,
+                              closed_interval=LIVE_REFRESH_SEC, snapshot_path=snapshot_path).start()
+    return QuoteRefresher(store, universe, cache=price_cache, source=yf_history, snapshot_path=snapshot_path).start()
 
-if 'portfolio' not in st.session_state: st.session_state.portfolio = load_data()
-if 'edit_index' not in st.session_state: st.session_state.edit_index = None
+refresher = get_refresher()
+
+# [개선 반영] 신호 엔진: 새 스냅샷마다 보유 종목별 고점/신호 상태를 갱신하고, 신호가 바뀐 종목만 알림
+# (data/signals{DATA_TAG}.jsonl 기록, SIGNAL_WEBHOOK_URL 설정 시 웹훅 전송, 열려 있는 화면에는 토스트)
+@st.cache_resource
+def get_signal_engine():
+    os.makedirs("data", exist_ok=True)
+    toasts = ToastSink()
+    engine = SignalEngine([LogSink(os.path.join("data", f"signals{DATA_TAG}.jsonl")), WebhookSink(os.environ.get("SIGNAL_WEBHOOK_URL")), toasts])
+    refresher.listeners.append(lambda snap: engine.on_snapshot(portfolio_store.load(), snap.closes))
+    return engine, toasts
+
+signal_engine, signal_toasts = get_signal_engine()
+if 'signal_seq' not in st.session_state: st.session_state.signal_seq = signal_toasts.since(0)[1]
+page_timer.lap('refresher')
+
+# 다른 세션의 수정도 바로 보이도록 매 실행마다 저장소에서 읽음 (SQLite 조회라 가벼움)
+portfolio = load_data()
+if 'edit_index' not in st.session_state or st.session_state.edit_index not in portfolio.index: st.session_state.edit_index = None
+page_timer.lap('portfolio_load')
 
 # --- 데이터 계산 ---
-portfolio_details = []
-total_buy_amt = total_val_amt = 0.0
-
-if not st.session_state.portfolio.empty:
-    with st.spinner('실시간 시세 동기화 중...'):
-        for idx, row in st.session_state.portfolio.iterrows():
-            ticker = str(row['종목코드'])
-            # [개선 반영] 접미사가 없는 경우만 처리 (속도 향상을 위해 period="1mo"로 최적화)
-            yf_ticker = ticker if "." in ticker else f"{ticker}.KS"
-            try:
-                # 1년치 데이터 대신 최근 1개월(고점 계산용) 데이터만 가져와 속도 개선
-                df_h = yf.Ticker(yf_ticker).history(period="1mo") 
-                if not df_h.empty:
-                    ref_dt = pd.to_datetime(row['기준일']).tz_localize('Asia/Seoul')
-                    df_since = df_h[df_h.index >= ref_dt]
-                    if df_since.empty: df_since = df_h
-                    curr, mx = df_h['Close'].iloc[-1], df_since['Close'].max()
-                    buy_amt, val_amt = row['평균매수가'] * row['주식수'], curr * row['주식수']
-                    p_rate = ((curr - row['평균매수가']) / row['평균매수가'] * 100) if row['평균매수가'] > 0 else 0
-                    
-                    portfolio_details.append({'idx': idx, 'row': row, 'curr': curr, 'mx': mx, 'val_amt': val_amt, 'buy_amt': buy_amt, 'p_rate': p_rate})
-                    total_buy_amt += buy_amt; total_val_amt += val_amt
-            except: continue
-    portfolio_details = sorted(portfolio_details, key=lambda x: x['val_amt'], reverse=True)
+# [개선 반영] 평가금액/수익률/고점/신호를 한 번에 벡터 계산, 아래 화면은 계산된 컬럼만 읽음
+# 공유 LiveValuation 이 직전 결과를 들고 있어 시세가 바뀐 종목만 다시 계산
+# [개선 반영] 평가 결과/시세/종목 목록은 프로세스 공유(읽기 전용), 세션에는 수정 중인 행 등 사용자 상태만 보관
+@st.cache_resource
+def get_live_valuation():
+    return LiveValuation()
+
+live_valuation = get_live_valuation()
+
+def current_valuation():
+    closes = refresher.closes(portfolio['종목코드'].map(yf_symbol))
+    valued, _ = live_valuation.update(portfolio, closes)
+    return valued, float(valued['매수금액'].sum()), float(valued['평가금액'].sum())
+
+valued, total_buy_amt, total_val_amt = current_valuation()
+page_timer.lap('signals')
 
 # --- 타이틀 ---
 st.title("📈 주식 관리 대시보드")
 st.write(f"**{date.today()}** 기준")
+# [개선 반영] 실시간 자동 갱신: 모니터링 목록과 자산 요약만 주기적으로 다시 실행 (입력 폼/차트는 그대로)
+live_every = LIVE_REFRESH_SEC if st.toggle(f"실시간 자동 갱신 ({LIVE_REFRESH_SEC}초)", key="live_mode") else None
+failures = refresher.failures  # 작업자가 통째로 교체하는 dict, 한 번만 읽어 사용
+if failures:
+    with st.expander(f"⚠️ 시세 조회 실패 {len(failures)}종목"):
+        for sym, f in failures.items():
+            st.write(f"{sym}: {f['error']} (연속 {f['count']}회, 마지막 {f['at']:%H:%M:%S})")
+
+page_timer.lap('render_header')
 
 # --- A. 실시간 리스트 ---
-if portfolio_details:
+@st.fragment(run_every=live_every)
+def monitor_section():
+    valued, _, _ = current_valuation()
+    events, st.session_state.signal_seq = signal_toasts.since(st.session_state.signal_seq)
+    for e in events[-5:]: st.toast(e.message(), icon="🔔")
+    snap, cache_stats = refresher.snapshot, price_cache.stats()
+    status = ("시세 첫 갱신 중 — 저장된 시세로 표시" if snap is None else f"시세 첫 갱신 중 — 지난 실행의 시세({snap.refreshed_at:%m-%d %H:%M})로 표시" if snap.warm
+              else f"시세 {snap.age():,.0f}초 전 갱신 (소요 {snap.duration:.1f}초)")
+    st.caption(f"{status} · 갱신 주기 {refresher.interval():,.0f}초 · "
+               f"캐시 hit {cache_stats['hits']} / miss {cache_stats['misses']} / evict {cache_stats['evictions']} · 보관 {cache_stats['size']}종목")
+    if valued.empty: return
     st.subheader("■실시간 모니터링 및 신호 확인")
-    # [개선 반영] vertical_alignment="center"를 사용하여 CSS 의존도 낮춤
-    h = st.columns([1.5, 1.2, 0.8, 0.5, 1.2, 1.2, 1.2, 1.0, 0.5, 0.5], vertical_alignment="center")
-    titles = ["종목명", "기준일(고점)", "평단가", "수량", "평가금액", "현재가(대비)", "수익(률)", "신호", "", ""]
-    for i, t in enumerate(titles): h[i].markdown(f"<p style='color:gray; font-size:0.9em; margin-bottom:0;'><b>{t}</b></p>", unsafe_allow_html=True)
-    
-    for item in portfolio_details:
-        st.markdown("<div class='stock-divider'></div>", unsafe_allow_html=True) 
-        r, curr, mx, p_rate = item['row'], item['curr'], item['mx'], item['p_rate']
-        sig, clr, bg = "HOLD", "#6c757d", "#e9ecef"
-        if p_rate <= -10: sig, clr, bg = "💥 손절(SELL)", "white", "#dc3545"
-        elif curr <= (mx * (1 - r['익절기준']/100)) and p_rate > 0: sig, clr, bg = "💰 익절(TAKE)", "white", "#28a745"
-        elif p_rate >= 50: sig, clr, bg = "🔥 ADD(추매)", "white", "#007bff"
-
-        d = st.columns([1.5, 1.2, 0.8, 0.5, 1.2, 1.2, 1.2, 1.0, 0.5, 0.5], vertical_alignment="center")
-        
-        d[0].markdown(f"**{r['종목명']}**")
-        d[1].markdown(f"<span style='font-size:0.85em;'>{r['기준일']}<br>(高:{mx:,.0f})</span>", unsafe_allow_html=True)
-        d[2].markdown(f"{r['평균매수가']:,.0f}")
-        d[3].markdown(f"{r['주식수']}")
-        d[4].markdown(f"{item['val_amt']:,.0f}원")
-        
-        drop_val = ((curr - mx) / mx * 100) if mx > 0 else 0
-        d[5].markdown(f"{curr:,.0f}원<br><span style='font-size:0.8em; color:{'#dc3545' if drop_val < 0 else '#28a745'};'>{drop_val:+.1f}%</span>", unsafe_allow_html=True)
-        
-        profit_val = item['val_amt'] - item['buy_amt']
-        d[6].markdown(f"<span style='color:{'#dc3545' if p_rate < 0 else '#28a745'}; font-weight:bold;'>{profit_val:,.0f}원<br>({p_rate:.1f}%)</span>", unsafe_allow_html=True)
-        
-        d[7].markdown(f"<div style='background-color:{bg}; color:{clr}; padding:4px 8px; border-radius:15px; text-align:center; font-weight:bold; font-size:0.7em;'>{sig}</div>", unsafe_allow_html=True)
-        
-        with d[8]:
-            if st.button("수정", key=f"e_{item['idx']}"):
-                st.session_state.edit_index = item['idx']; st.rerun()
-        with d[9]:
-            if st.button("삭제", key=f"d_{item['idx']}"):
-                st.session_state.portfolio = st.session_state.portfolio.drop(item['idx'])
-                save_data(st.session_state.portfolio); st.rerun()
+    # [개선 반영] 보유 종목이 많으면 종목별 위젯 행 대신 표 하나로 렌더링 (행 선택으로 수정/삭제)
+    compact = st.toggle("표 형식으로 보기", value=len(valued) > 30, key="compact_view")
+    action = render_table(valued) if compact else render_rows(valued)
+    if action:
+        kind, idx = action
+        if kind == 'edit': st.session_state.edit_index = idx
+        else: trade_ledger.void(idx, date.today().strftime('%Y-%m-%d'))  # 잘못 입력한 포지션 정정 (손익 없이 0주)
+        st.rerun()
+
+monitor_section()
 
+page_timer.lap('render_list')
 st.divider()
 
 # --- B. 종목 추가/수정 (유지) ---
 with st.container():
-    title_text = "🔍 종목 정보 수정" if st.session_state.edit_index is not None else "➕ 신규 종목 추가"
+    title_text = "🔍 거래 입력 (추가 매수/매도)" if st.session_state.edit_index is not None else "➕ 신규 종목 매수"
     with st.expander(title_text, expanded=(st.session_state.edit_index is not None)):
         def_name, def_date, def_price, def_qty, def_target = "", date.today(), 0, 0, 15
+        trade_kind, price_label = "추가 매수", "평균매수가"
         if st.session_state.edit_index is not None:
-            edit_row = st.session_state.portfolio.loc[st.session_state.edit_index]
-            def_name, def_date = edit_row['종목명'], pd.to_datetime(edit_row['기준일']).date()
-            def_price, def_qty, def_target = int(edit_row['평균매수가']), int(edit_row['주식수']), int(edit_row['익절기준'])
+            edit_row = valued.loc[st.session_state.edit_index]
+            def_name, def_target = edit_row['종목명'], int(edit_row['익절기준'])
+            def_price = int(edit_row['현재가']) if pd.notna(edit_row['현재가']) else int(edit_row['평균매수가'])
+            st.caption(f"보유 {int(edit_row['주식수']):,}주 · 평균매수가 {edit_row['평균매수가']:,.0f}원 · 기준일 {edit_row['기준일']}")
+            trade_kind = st.radio("거래", ["추가 매수", "매도", "익절기준만 변경"], horizontal=True)
+            price_label = "매도가" if trade_kind == "매도" else "매수가"
 
+        # [개선 반영] 전체 종목 목록 대신 검색어(이름/초성/종목코드)에 맞는 상위 후보만 전달
+        query = st.text_input("종목 검색", placeholder="종목명, 초성(예: ㅅㅅㅈㅈ) 또는 종목코드 입력 후 Enter")
+        matches = symbol_index.search.query(query) if query else []
+        if def_name and def_name not in matches: matches = [def_name] + matches
         c1, c2, c3, c4, c5 = st.columns(5)
-        with c1: add_name = st.selectbox("종목명", options=[""] + stock_names, index=(stock_names.index(def_name)+1 if def_name in stock_names else 0))
-        with c2: add_date = st.date_input("기준일", value=def_date)
-        with c3: add_price = st.number_input("평균매수가", min_value=0, value=def_price)
+        with c1: add_name = st.selectbox("종목명", options=[""] + matches, index=(matches.index(def_name)+1 if def_name in matches else 1 if matches else 0), disabled=st.session_state.edit_index is not None)
+        with c2: add_date = st.date_input("기준일" if st.session_state.edit_index is None else "거래일", value=def_date)
+        with c3: add_price = st.number_input(price_label, min_value=0, value=def_price)
         with c4: add_qty = st.number_input("수량", min_value=0, value=def_qty)
         with c5: add_target = st.number_input("익절기준(%)", value=def_target)
 
         if st.button("저장", type="primary"):
             if add_name:
-                code_val = stock_dict[add_name]
+                code_val = stock_dict[add_name] if st.session_state.edit_index is None else edit_row['종목코드']
                 new_row = {"종목명": add_name, "종목코드": code_val, "기준일": add_date.strftime('%Y-%m-%d'), "평균매수가": add_price, "주식수": add_qty, "익절기준": add_target}
-                if st.session_state.edit_index is not None:
-                    st.session_state.portfolio.loc[st.session_state.edit_index] = new_row
-                    st.session_state.edit_index = None
-                else:
-                    st.session_state.portfolio = pd.concat([st.session_state.portfolio, pd.DataFrame([new_row])], ignore_index=True)
-                save_data(st.session_state.portfolio); st.rerun()
+                idx = st.session_state.edit_index
+                try:
+                    if idx is None: trade_ledger.buy(new_row)
+                    elif trade_kind == "매도": trade_ledger.sell(idx, add_qty, add_price, new_row['기준일'])
+                    elif trade_kind == "추가 매수": trade_ledger.buy(new_row, position=idx)
+                    if idx is not None and trade_kind != "추가 매수" and add_target != def_target: trade_ledger.set_take(idx, add_target, new_row['기준일'])
+                except ValueError as e:
+                    st.error(str(e)); st.stop()
+                st.session_state.edit_index = None
+                refresher.wake(); st.rerun()
 
+page_timer.lap('render_form')
 st.markdown("<br>", unsafe_allow_html=True)
 
 # --- C. 자산 요약 (유지) ---
-st.subheader("📊 자산 요약 현황")
-curr_cash = load_cash()
-t_profit = total_val_amt - total_buy_amt
-t_rate = (t_profit / total_buy_amt * 100) if total_buy_amt > 0 else 0.0
+@st.fragment(run_every=live_every)
+def summary_section():
+    _, total_buy_amt, total_val_amt = current_valuation()
+    st.subheader("📊 자산 요약 현황")
+    t_profit = total_val_amt - total_buy_amt
+    t_rate = (t_profit / total_buy_amt * 100) if total_buy_amt > 0 else 0.0
 
-m1, m2, m3, m4 = st.columns(4)
-m1.metric("💰 총 매수원금", f"{total_buy_amt:,.0f}원")
-m2.metric("📊 현재 평가액", f"{total_val_amt:,.0f}원")
-m3.metric("📈 총 수익 (수익률)", f"{t_profit:,.0f}원", delta=f"{t_rate:.2f}%")
-m4.metric("🏦 합계 자산(현금포함)", f"{total_val_amt + curr_cash:,.0f}원")
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("💰 총 매수원금", f"{total_buy_amt:,.0f}원")
+    m2.metric("📊 현재 평가액", f"{total_val_amt:,.0f}원")
+    m3.metric("📈 총 수익 (수익률)", f"{t_profit:,.0f}원", delta=f"{t_rate:.2f}%")
+    m4.metric("🏦 합계 자산(현금포함)", f"{total_val_amt + load_cash():,.0f}원")
+    st.caption(f"미실현 손익 {t_profit:,.0f}원 · 누적 실현 손익(매도분) {trade_ledger.realized_total():,.0f}원")
 
+summary_section()
+curr_cash = load_cash()
+
+page_timer.lap('render_summary')
 st.markdown("<br>", unsafe_allow_html=True)
 
 # --- D. 비중 분석 및 현금 관리 (유지) ---
 c_btm1, c_btm2 = st.columns([1.5, 1])
 with c_btm1:
     if total_val_amt > 0:
+        import plotly.express as px  # [개선 반영] 차트를 그릴 때만 로드 (시작 시간 단축)
         st.subheader("🥧 자산 구성 비중")
-        p_data = pd.DataFrame([{'종목': i['row']['종목명'], '금액': i['val_amt']} for i in portfolio_details])
+        p_data = valued[['종목명', '평가금액']].rename(columns={'종목명': '종목', '평가금액': '금액'})
         p_data = pd.concat([p_data, pd.DataFrame([{'종목': '예수금', '금액': curr_cash}])])
         fig = px.pie(p_data, values='금액', names='종목', hole=0.4, color_discrete_sequence=px.colors.qualitative.Safe)
         fig.update_layout(margin=dict(t=0, b=0, l=0, r=0), showlegend=True)
         st.plotly_chart(fig, use_container_width=True)
+    page_timer.lap('render_pie')
 
 with c_btm2:
     st.subheader("💵 현금 관리")
     nc = st.number_input("현재 보유 예수금(원)", value=curr_cash, step=10000.0)
     if st.button("현금 잔액 업데이트"):
         save_cash(nc); st.rerun()
+    st.download_button("포트폴리오 CSV 내보내기", portfolio_store.export_csv(), file_name="portfolio.csv", mime="text/csv")
+    with st.expander("📒 최근 거래 원장"):
+        st.dataframe(trade_ledger.trades(limit=50), use_container_width=True)
+page_timer.lap('render_cash')
+
+# --- D-2. 자산 추이 (NAV) ---
+# [개선 반영] 일별 NAV 는 저장된 테이블을 새 거래일만큼만 연장, 차트는 테이블(NAV/낙폭 컬럼)만 읽음
+@st.cache_resource
+def get_nav_history():
+    return NavHistory(os.path.join("data", f"nav{DATA_TAG}.parquet"))
 
+nav = get_nav_history().update(portfolio, refresher.closes(portfolio['종목코드'].map(yf_symbol)), curr_cash, trade_ledger)
+if not nav.empty:
+    import plotly.express as px
+    st.subheader("📉 자산 추이 (NAV)")
+    n1, n2 = st.columns([1.5, 1])
+    fig_nav = px.line(nav, y=['NAV', '매수금액'], labels={'value': '금액(원)', 'index': '', 'variable': ''})
+    fig_nav.update_layout(margin=dict(t=10, b=0, l=0, r=0), legend=dict(orientation='h'))
+    n1.plotly_chart(fig_nav, use_container_width=True)
+    fig_dd = px.area(nav, y='낙폭', labels={'낙폭': '고점 대비 낙폭(%)', 'index': ''}, color_discrete_sequence=["#dc3545"])
+    fig_dd.update_layout(margin=dict(t=10, b=0, l=0, r=0))
+    n2.plotly_chart(fig_dd, use_container_width=True)
+    n2.caption(f"최대 낙폭 {nav['낙폭'].min():.1f}% · 현재 {nav['낙폭'].iloc[-1]:.1f}% · {len(nav):,}거래일")
+page_timer.lap('render_nav')
 
+# --- E. 성능 계측 ---
+RUNS.add(page_timer)
+profile_report = page_profiler.stop() if page_profiler else None
+with st.expander("🛠 성능 계측 (최근 실행 단계별 p50/p95)", expanded=profile_report is not None):
+    st.dataframe(RUNS.summary().style.format({'최근(ms)': '{:,.1f}', 'p50(ms)': '{:,.1f}', 'p95(ms)': '{:,.1f}'}), hide_index=True, use_container_width=True)
+    e1, e2 = st.columns(2)
+    e1.download_button("JSON lines 내보내기", RUNS.to_jsonl(), file_name="timings.jsonl", mime="application/jsonl")
+    if e2.button("다음 실행 1회 프로파일링"):
+        st.session_state.profile_next_run = True; st.rerun()
+    if profile_report: st.code(profile_report, language=None)
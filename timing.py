@@ -0,0 +1,81 @@
+# 실행 단계별 시간 계측: 단계/종목별 소요시간을 기록하고 최근 실행들의 횟수, p50/p95 를 집계
+# - 페이지 실행은 lap() 으로 구간을 끊어 기록, 백그라운드 갱신은 종목별 조회 시간까지 기록
+# - 최근 실행 기록은 프로세스 전역에 보관, JSON lines 로 내보내기 가능
+# - RunProfiler: 한 번의 실행을 pyinstrument(설치 시) 또는 cProfile 로 프로파일링
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from quotes import kst_now
+
+
+class RunTimer:
+    def __init__(self, kind):
+        self.kind, self.started_at = kind, kst_now()
+        self.stages, self.tickers = {}, {}
+        self._t0 = self._last = time.perf_counter()
+
+    def lap(self, name):
+        # 직전 lap 이후 경과 시간을 name 단계로 기록
+        now = time.perf_counter()
+        self.stages[name] = self.stages.get(name, 0.0) + now - self._last
+        self._last = now
+
+    def record(self):
+        return {'kind': self.kind, 'ts': self.started_at.isoformat(), 'total': time.perf_counter() - self._t0,
+                'stages': dict(self.stages), 'tickers': dict(self.tickers)}
+
+
+class TimingLog:
+    def __init__(self, maxlen=200):
+        self.runs = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def add(self, timer):
+        with self._lock: self.runs.append(timer.record())
+
+    def summary(self, kind=None):
+        # 단계별(종목 조회는 'fetch:티커') 횟수, 마지막/p50/p95 (ms)
+        samples = {}
+        with self._lock: runs = [r for r in self.runs if kind is None or r['kind'] == kind]
+        for r in runs:
+            samples.setdefault(f"{r['kind']}:total", []).append(r['total'])
+            for name, sec in r['stages'].items(): samples.setdefault(f"{r['kind']}:{name}", []).append(sec)
+            for sym, sec in r['tickers'].items(): samples.setdefault(f"fetch:{sym}", []).append(sec)
+        rows = [{'단계': name, '횟수': len(v), '최근(ms)': v[-1] * 1000, 'p50(ms)': np.percentile(v, 50) * 1000,
+                 'p95(ms)': np.percentile(v, 95) * 1000} for name, v in samples.items()]
+        return pd.DataFrame(rows, columns=['단계', '횟수', '최근(ms)', 'p50(ms)', 'p95(ms)'])
+
+    def to_jsonl(self):
+        with self._lock: return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in self.runs)
+
+
+class RunProfiler:
+    # start() ~ stop() 구간을 프로파일링해 보고서 텍스트 반환 (pyinstrument 가 없으면 cProfile)
+    def start(self):
+        try:
+            from pyinstrument import Profiler
+            self._prof = Profiler(); self._prof.start()
+        except ImportError:
+            self._prof = cProfile.Profile(); self._prof.enable()
+        return self
+
+    def stop(self):
+        if isinstance(self._prof, cProfile.Profile):
+            self._prof.disable()
+            buf = io.StringIO()
+            pstats.Stats(self._prof, stream=buf).sort_stats('cumulative').print_stats(40)
+            return buf.getvalue()
+        self._prof.stop()
+        return self._prof.output_text(unicode=True)
+
+
+# 프로세스 전역 실행 기록 (페이지 실행 'page', 백그라운드 갱신 'refresh')
+RUNS = TimingLog()
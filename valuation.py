@@ -0,0 +1,69 @@
+# 포트폴리오 평가 및 신호 계산: 보유 종목 DataFrame + 종가 패널 -> 파생 컬럼과 신호를 벡터 연산으로 한 번에 계산
+import numpy as np
+import pandas as pd
+
+from quotes import KST, yf_symbol
+
+# 신호 -> (표시 문구, 글자색, 배경색)
+SIGNAL_STYLE = {
+    'HOLD': ("HOLD", "#6c757d", "#e9ecef"),
+    'SELL': ("💥 손절(SELL)", "white", "#dc3545"),
+    'TAKE': ("💰 익절(TAKE)", "white", "#28a745"),
+    'ADD': ("🔥 ADD(추매)", "white", "#007bff"),
+}
+VALUED_COLS = ['티커', '현재가', '고점', '매수금액', '평가금액', '수익금', '수익률', '고점대비', '신호']
+
+
+def signal_masks(p_rate, curr, mx, take_pct, stop_pct=-10.0, add_pct=50.0):
+    # 우선순위: 손절 > 익절(고점 대비 take_pct% 하락, 수익 중일 때) > 추매. 서로 겹치지 않는 (SELL, TAKE, ADD) 마스크
+    sell = p_rate <= stop_pct
+    take = (curr <= mx * (1 - take_pct / 100)) & (p_rate > 0) & ~sell
+    return sell, take, (p_rate >= add_pct) & ~sell & ~take
+
+
+def signals(p_rate, curr, mx, take_pct, stop_pct=-10.0, add_pct=50.0):
+    p_rate, curr, mx, take_pct = map(np.asarray, (p_rate, curr, mx, take_pct))
+    return np.select(signal_masks(p_rate, curr, mx, take_pct, stop_pct, add_pct), ['SELL', 'TAKE', 'ADD'], default='HOLD')
+
+
+def evaluate(portfolio, closes, stop_pct=-10.0, add_pct=50.0, take_pct=None):
+    # closes: 날짜(KST) x 티커 종가 패널. 시세가 없는 종목은 결과에서 빠짐(기존 동작과 동일)
+    # take_pct 가 None 이면 종목별 '익절기준' 컬럼 사용
+    tickers = portfolio['종목코드'].map(yf_symbol).to_numpy()
+    col = pd.Index(closes.columns).get_indexer(tickers)
+    X = closes.to_numpy(dtype=float)[:, col] if len(closes.columns) else np.empty((len(closes), len(tickers)))
+    valid = ~np.isnan(X) & (col >= 0)
+    have = valid.any(axis=0)
+    if not have.any(): return portfolio.iloc[:0].reindex(columns=list(portfolio.columns) + VALUED_COLS)
+    pf, X, valid, tickers = portfolio[have], X[:, have], valid[:, have], tickers[have]
+
+    # 현재가: 종목별 마지막 유효 종가
+    last = X.shape[0] - 1 - np.argmax(valid[::-1], axis=0)
+    curr = X[last, np.arange(X.shape[1])]
+    # 고점: 기준일 이후 최고 종가, 기준일 이후 데이터가 없으면 전체 구간 최고가
+    ref = pd.DatetimeIndex(pd.to_datetime(pf['기준일'], format='%Y-%m-%d')).tz_localize(KST).as_unit('ns').asi8
+    since = valid & (pd.DatetimeIndex(closes.index).as_unit('ns').asi8[:, None] >= ref[None, :])
+    mx = np.where(since.any(axis=0), np.where(since, X, -np.inf).max(axis=0), np.where(valid, X, -np.inf).max(axis=0))
+
+    avg, qty = pf['평균매수가'].to_numpy(dtype=float), pf['주식수'].to_numpy(dtype=float)
+    buy_amt, val_amt = avg * qty, curr * qty
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p_rate = np.where(avg > 0, (curr - avg) / avg * 100, 0.0)
+        drop = np.where(mx > 0, (curr - mx) / mx * 100, 0.0)
+    take = pf['익절기준'].to_numpy(dtype=float) if take_pct is None else np.full(len(pf), float(take_pct))
+
+    # 컬럼을 하나씩 추가하면 매번 블록 재배치가 일어나므로 한 번에 붙임
+    derived = pd.DataFrame({'티커': tickers, '현재가': curr, '고점': mx, '매수금액': buy_amt, '평가금액': val_amt, '수익금': val_amt - buy_amt,
+                            '수익률': p_rate, '고점대비': drop, '신호': signals(p_rate, curr, mx, take, stop_pct, add_pct)}, index=pf.index)
+    return pd.concat([pf, derived], axis=1)
+
+
+
+def summarize(valued, by):
+    # by 컬럼(예: 파일)별 합계와 신호 개수
+    g = valued.groupby(by, sort=False)
+    out = g[['매수금액', '평가금액']].sum()
+    out['수익금'] = out['평가금액'] - out['매수금액']
+    out['수익률'] = np.where(out['매수금액'] > 0, out['수익금'] / out['매수금액'].where(out['매수금액'] > 0) * 100, 0.0)
+    counts = pd.crosstab(valued[by], valued['신호']).reindex(columns=list(SIGNAL_STYLE), fill_value=0)
+    return out.join(counts)